@@ -376,6 +376,12 @@ DEFAULT_DOT_SIZE_MULTIPLIER = 1.0
 DEFAULT_COLOR_PALETTE = 'inferno'
 DEFAULT_BASEMAP = 'Dark'
 
+# Overview maps with at least this many points are drawn with deck.gl (WebGL) instead of folium
+WEBGL_MAP_MIN_POINTS = 2000
+
+# Maps above this many points keep one detection per ~100 m cell, cluster and date
+THIN_MAP_MIN_POINTS = 5000
+
 # Color palettes for map visualization
 COLOR_PALETTES = {
     'inferno': ['#FCFFA4', '#F8DF3A', '#FB9E3A', '#ED6925', '#D94E11', '#B62A07', '#8B0F07', '#5D0C0C', '#420A68'],
@@ -388,6 +394,13 @@ COLOR_PALETTES = {
 # Large countries that might be slow with wide date ranges
 LARGE_COUNTRIES = ['United States', 'China', 'Russia', 'Canada', 'Brazil', 'Australia', 'India']
 
+# Sub-regions used to split Russia into smaller FIRMS requests
+RUSSIA_REGIONS = [
+    ('Western', '19.25,41.151,60.0,81.2'),
+    ('Central', '60.0,41.151,120.0,81.2'),
+    ('Eastern', '120.0,41.151,180.0,81.2')
+]
+
 # Default clustering parameters
 DEFAULT_EPS = 0.01
 DEFAULT_MIN_SAMPLES = 5
\ No newline at end of file
@@ -7,7 +7,7 @@ import numpy as np
 import streamlit as st
 import altair as alt
 
-from app.core.utils import get_temp_column, get_category_display_name, get_category_singular
+from app.core.utils import get_temp_column, get_category_display_name, get_category_singular, format_date
 
 def create_cluster_summary(df, category="fires"):
     """
@@ -48,6 +48,11 @@ def create_cluster_summary(df, category="fires"):
         'Mean FRP', 'Total FRP', 'First Detection', 'Last Detection'
     ]
     
+    # Show detection dates without the midnight time of the parsed dates
+    for column in ('First Detection', 'Last Detection'):
+        if pd.api.types.is_datetime64_any_dtype(cluster_summary[column]):
+            cluster_summary[column] = cluster_summary[column].dt.strftime('%Y-%m-%d')
+    
     # Add temperature statistics based on dataset type
     temp_col = get_temp_column(df)
     if temp_col:
@@ -269,7 +274,7 @@ def display_feature_exploration(df, cluster_id, category, current_date=None):
     category_display = get_category_display_name(category)
     
     if current_date is not None:
-        st.write(f"### {category_display} {cluster_id} Data for {current_date}")
+        st.write(f"### {category_display} {cluster_id} Data for {format_date(current_date)}")
     else:
         st.write(f"### {category_display} {cluster_id} Evolution Over Time")
     
@@ -277,7 +282,7 @@ def display_feature_exploration(df, cluster_id, category, current_date=None):
     
     selected_features = []
     
-    playback_suffix = f"_playback_{current_date}" if current_date is not None else ""
+    playback_suffix = f"_playback_{format_date(current_date)}" if current_date is not None else ""
     frp_key = f"show_frp_{cluster_id}{playback_suffix}"
     temp_key = f"show_temp_{cluster_id}{playback_suffix}"
     
@@ -361,12 +366,12 @@ def display_coordinate_view(df, playback_date=None):
         
         if not cluster_points.empty:
             if playback_date is not None:
-                st.subheader(f"Points in Cluster {st.session_state.selected_cluster} on {playback_date}")
+                st.subheader(f"Points in Cluster {st.session_state.selected_cluster} on {format_date(playback_date)}")
             else:
                 if not st.session_state.get('playback_mode', False):
                     st.subheader(f"Point Details in Cluster {st.session_state.selected_cluster}")
                 else:
-                    st.subheader(f"Point Details in Cluster {st.session_state.selected_cluster} on {st.session_state.playback_dates[st.session_state.playback_index]}")
+                    st.subheader(f"Point Details in Cluster {st.session_state.selected_cluster} on {format_date(st.session_state.playback_dates[st.session_state.playback_index])}")
             
             # Create a display version of the dataframe with formatted columns
             display_df = cluster_points[['latitude', 'longitude', 'frp', 'acq_date', 'acq_time']].copy()
@@ -393,7 +398,7 @@ def display_coordinate_view(df, playback_date=None):
                 column_config={
                     "Coordinates": "Lat, Long",
                     "frp": st.column_config.NumberColumn("FRP", format="%.2f"),
-                    "acq_date": "Date",
+                    "acq_date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
                     "acq_time": "Time",
                     "temperature": st.column_config.NumberColumn("Temp (K)", format="%.2f")
                 },
@@ -402,6 +407,6 @@ def display_coordinate_view(df, playback_date=None):
             )
         else:
             st.warning(f"No points found for Cluster {st.session_state.selected_cluster}" + 
-                      (f" on {playback_date}" if playback_date is not None else ""))
+                      (f" on {format_date(playback_date)}" if playback_date is not None else ""))
     else:
         st.info("Select a cluster to view detailed point information.")
\ No newline at end of file
@@ -3,14 +3,500 @@ FIRMS API handler for the Fire Investigation Tool.
 Provides functionality to fetch and process fire data from NASA's FIRMS API
 with support for historical data, large country handling, and advanced clustering.
 """
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import requests
 import streamlit as st
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from datetime import datetime, date, timedelta
+from functools import lru_cache
+import os
 import time
 
+from app.config.settings import COUNTRY_BBOXES, US_STATE_BBOXES, RUSSIA_REGIONS, get_country_geojson
 from app.core.osm_handler import OSMHandler
+from app.core.utils import get_temp_column
+
+# Check if shapely is available for strict country filtering
+try:
+    import shapely
+    from shapely.geometry import shape
+    from shapely.strtree import STRtree
+    HAVE_SHAPELY = True
+except ImportError:
+    HAVE_SHAPELY = False
+
+# Check if numexpr is available to evaluate the bbox mask in a single pass
+try:
+    import numexpr as ne
+    HAVE_NUMEXPR = True
+except ImportError:
+    HAVE_NUMEXPR = False
+
+# Import dataset availability info from settings
+try:
+    from app.config.settings import DATASET_AVAILABILITY
+except ImportError:
+    # Fallback if not available in settings - UPDATE THESE DATES
+    DATASET_AVAILABILITY = {
+        'MODIS_NRT': {'min_date': '2024-12-01', 'max_date': '2025-03-24'},
+        'MODIS_SP': {'min_date': '2000-11-01', 'max_date': '2024-12-31'},
+        'VIIRS_NOAA20_NRT': {'min_date': '2024-12-01', 'max_date': '2025-03-24'},
+        'VIIRS_NOAA20_SP': {'min_date': '2018-04-01', 'max_date': '2025-03-24'},  # Updated end date
+        'VIIRS_NOAA21_NRT': {'min_date': '2024-01-17', 'max_date': '2025-03-24'},
+        'VIIRS_SNPP_NRT': {'min_date': '2025-01-01', 'max_date': '2025-03-24'},
+        'VIIRS_SNPP_SP': {'min_date': '2012-01-20', 'max_date': '2025-03-24'},  # Updated end date
+        'LANDSAT_NRT': {'min_date': '2022-06-20', 'max_date': '2025-03-24'}
+    }
+
+# Availability windows parsed once into (min_date, max_date) date pairs
+DATASET_DATE_WINDOWS = {
+    name: (date.fromisoformat(window['min_date']), date.fromisoformat(window['max_date']))
+    for name, window in DATASET_AVAILABILITY.items()
+}
+
+# Columns that identify a single FIRMS detection; satellite is used when present
+DETECTION_KEY_COLUMNS = ['latitude', 'longitude', 'acq_date', 'acq_time']
+
+# Inputs smaller than this are clustered with a single DBSCAN run
+TILED_DBSCAN_MIN_POINTS = 20000
+
+# Number of bytes read when probing whether a dataset has any records
+PROBE_BYTES = 4096
+
+# Cells along the longer side of the coarse grid used for strict country filtering
+BORDER_GRID_CELLS = 256
+
+# Verdicts stored in the border grid
+CELL_OUTSIDE, CELL_INSIDE, CELL_BORDER = 0, 1, 2
+
+# Border point tests are split across threads above this many points
+PARALLEL_CONTAINS_MIN_POINTS = 100000
+
+# Maximum number of date chunks requested from the FIRMS API at once
+FETCH_MAX_WORKERS = 8
+
+def _bbox_indices(lon, lat, bbox_coords):
+    """
+    Return the positions of the points that fall inside a bounding box.
+    
+    Args:
+        lon (numpy.ndarray): Longitude values
+        lat (numpy.ndarray): Latitude values
+        bbox_coords (sequence): (min_lon, min_lat, max_lon, max_lat)
+        
+    Returns:
+        numpy.ndarray: Integer positions of the points inside the box
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox_coords
+    if HAVE_NUMEXPR:
+        mask = ne.evaluate('(lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)')
+    else:
+        mask = (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+    return np.flatnonzero(mask)
+
+def _read_csv_response(response):
+    """
+    Parse a FIRMS CSV response from its raw bytes.
+    
+    Reading from the undecoded body avoids building the decoded str and a
+    StringIO copy of it before pandas makes its own.
+    
+    Args:
+        response (requests.Response): FIRMS API response
+        
+    Returns:
+        pandas.DataFrame: Parsed records, or None if the body is empty or an error message
+    """
+    content = response.content
+    if not content.strip():
+        return None
+    # FIRMS reports errors as a short plain-text body rather than a CSV
+    head = content[:200]
+    if b"Invalid" in head or b"Error" in head:
+        return None
+    return pd.read_csv(BytesIO(content))
+
+def _collect_chunk(chunk_frames, chunk_df, chunk_start_str, chunk_end_str):
+    """
+    Append a fetched chunk to the list of frames to concatenate.
+    
+    Records outside the chunk's requested date range are dropped first.
+    
+    Args:
+        chunk_frames (list): Frames collected so far
+        chunk_df (pandas.DataFrame): Parsed chunk
+        chunk_start_str (str): First date of the chunk (YYYY-MM-DD)
+        chunk_end_str (str): Last date of the chunk (YYYY-MM-DD)
+    """
+    if 'acq_date' in chunk_df.columns:
+        acq_date = chunk_df['acq_date']
+        chunk_df = chunk_df[(acq_date >= chunk_start_str) & (acq_date <= chunk_end_str)]
+    if not chunk_df.empty:
+        chunk_frames.append(chunk_df)
+
+def _drop_duplicate_detections(df):
+    """
+    Drop repeated detections, e.g. from overlapping NRT and SP chunks.
+    
+    Args:
+        df (pandas.DataFrame): Combined FIRMS records
+        
+    Returns:
+        pandas.DataFrame: Records with exact duplicates removed
+    """
+    if df.empty or not all(col in df.columns for col in DETECTION_KEY_COLUMNS):
+        return df
+    subset = DETECTION_KEY_COLUMNS + (['satellite'] if 'satellite' in df.columns else [])
+    return df.drop_duplicates(subset=subset, keep='first', ignore_index=True)
+
+@lru_cache(maxsize=64)
+def _country_geometry(country):
+    """
+    Load a country's border polygons and index them, cached per country.
+    
+    Args:
+        country (str): Country name
+        
+    Returns:
+        tuple: (prepared country polygon, STRtree of its polygon parts, border grid),
+            or (None, None, None) if no border data is available
+    """
+    # Get the country GeoJSON
+    country_geojson = get_country_geojson(country)
+    if not country_geojson:
+        return None, None, None
+    
+    # Convert to shapely geometries
+    if 'features' in country_geojson:
+        # Multiple features case
+        country_polygons = [
+            shape(feature['geometry'])
+            for feature in country_geojson['features']
+            if feature['geometry']['type'] in ['Polygon', 'MultiPolygon']
+        ]
+    else:
+        # Single geometry case
+        country_polygons = [shape(country_geojson['geometry'])]
+    
+    # Index the individual polygon parts so each point is only
+    # tested against the parts whose envelope contains it
+    parts = shapely.get_parts(country_polygons)
+    shapely.prepare(parts)
+    country_tree = STRtree(parts)
+    country_polygon = shapely.union_all(parts)
+    shapely.prepare(country_polygon)
+    return country_polygon, country_tree, _border_grid(parts, country_tree, country_polygon.bounds)
+
+def _border_grid(parts, tree, bounds, n_cells=BORDER_GRID_CELLS):
+    """
+    Classify a coarse grid over a country as inside, outside or on its border.
+    
+    Cells are padded by a tiny margin so that a point rounded into a
+    neighbouring cell still gets a correct verdict.
+    
+    Args:
+        parts (numpy.ndarray): Prepared polygon parts of the country
+        tree (STRtree): Spatial index over the parts
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) of the country
+        n_cells (int): Number of cells along the longer side of the bounds
+        
+    Returns:
+        tuple: (min_lon, min_lat, cell size, uint8 verdicts indexed [lon cell, lat cell])
+    """
+    min_lon, min_lat, max_lon, max_lat = bounds
+    cell = max(max_lon - min_lon, max_lat - min_lat) / n_cells
+    if cell <= 0:
+        return None
+    nx = max(int(np.ceil((max_lon - min_lon) / cell)), 1)
+    ny = max(int(np.ceil((max_lat - min_lat) / cell)), 1)
+    
+    ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing='ij')
+    x0 = min_lon + ix.ravel() * cell
+    y0 = min_lat + iy.ravel() * cell
+    pad = cell * 1e-6
+    boxes = shapely.box(x0 - pad, y0 - pad, x0 + cell + pad, y0 + cell + pad)
+    
+    # Cells touching no part are outside; those lying in a part's interior are inside
+    verdicts = np.full(nx * ny, CELL_OUTSIDE, dtype=np.uint8)
+    box_idx, part_idx = tree.query(boxes, predicate='intersects')
+    verdicts[box_idx] = CELL_BORDER
+    inside = shapely.contains_properly(parts[part_idx], boxes[box_idx])
+    verdicts[box_idx[inside]] = CELL_INSIDE
+    
+    return min_lon, min_lat, cell, verdicts.reshape(nx, ny)
+
+def _grid_verdicts(lon, lat, grid):
+    """
+    Look up the border grid verdict for each point.
+    
+    Args:
+        lon (numpy.ndarray): Longitude values
+        lat (numpy.ndarray): Latitude values
+        grid (tuple): Border grid from _border_grid
+        
+    Returns:
+        numpy.ndarray: CELL_OUTSIDE, CELL_INSIDE or CELL_BORDER per point
+    """
+    min_lon, min_lat, cell, verdicts = grid
+    ix = np.floor((lon - min_lon) / cell)
+    iy = np.floor((lat - min_lat) / cell)
+    on_grid = (ix >= 0) & (ix < verdicts.shape[0]) & (iy >= 0) & (iy < verdicts.shape[1])
+    
+    result = np.full(len(lon), CELL_OUTSIDE, dtype=np.uint8)
+    result[on_grid] = verdicts[ix[on_grid].astype(np.intp), iy[on_grid].astype(np.intp)]
+    return result
+
+def _country_mask(country, lon, lat, bbox_coords):
+    """
+    Test which points lie inside a country's actual borders.
+    
+    Args:
+        country (str): Country name
+        lon (numpy.ndarray): Longitude values
+        lat (numpy.ndarray): Latitude values
+        bbox_coords (sequence): (min_lon, min_lat, max_lon, max_lat) box holding the points
+        
+    Returns:
+        numpy.ndarray: Boolean mask of points inside the country,
+            or None if no border data is available
+    """
+    country_polygon, country_tree, border_grid = _country_geometry(country)
+    if country_tree is None:
+        return None
+    
+    query_box = shapely.box(*bbox_coords)
+    if shapely.contains_properly(country_polygon, query_box):
+        # The whole bbox lies inside the country, so every point passes
+        return np.ones(len(lon), dtype=bool)
+    if shapely.disjoint(country_polygon, query_box):
+        # The bbox misses the country entirely, so no point can pass
+        return np.zeros(len(lon), dtype=bool)
+    
+    if border_grid is None:
+        in_country = np.zeros(len(lon), dtype=bool)
+        candidates = np.arange(len(lon))
+    else:
+        # Settle most points from the coarse grid and only
+        # test those in border cells against the polygons
+        verdicts = _grid_verdicts(lon, lat, border_grid)
+        in_country = verdicts == CELL_INSIDE
+        candidates = np.flatnonzero(verdicts == CELL_BORDER)
+    
+    if len(candidates) > PARALLEL_CONTAINS_MIN_POINTS:
+        # GEOS releases the GIL, so threads scale the remaining point tests
+        # without pickling the polygon into other processes
+        chunks = np.array_split(candidates, os.cpu_count() or 1)
+        with ThreadPoolExecutor() as executor:
+            inside = executor.map(
+                lambda idx: shapely.contains_xy(country_polygon, lon[idx], lat[idx]), chunks
+            )
+            in_country[candidates] = np.concatenate(list(inside))
+    elif len(candidates) > 0:
+        in_country[candidates] = shapely.contains_xy(country_polygon, lon[candidates], lat[candidates])
+    return in_country
+
+def _build_cluster_coords(lat, lon, day=None, day_scale=0.0):
+    """
+    Build the DBSCAN input matrix straight from the raw coordinate arrays.
+    
+    Writes a single contiguous float32 (n, 2) or (n, 3) array instead of
+    going through an intermediate DataFrame.
+    
+    Args:
+        lat (numpy.ndarray): Latitude values
+        lon (numpy.ndarray): Longitude values
+        day (numpy.ndarray, optional): Day offsets for temporal clustering
+        day_scale (float): Weight applied to the day offsets
+        
+    Returns:
+        numpy.ndarray: Coordinate matrix with columns (lat, lon[, scaled_day])
+    """
+    coords = np.empty((lat.size, 2 if day is None else 3), dtype=np.float32)
+    coords[:, 0] = lat
+    coords[:, 1] = lon
+    if day is not None:
+        np.multiply(day, day_scale, out=coords[:, 2])
+    return coords
+
+def _dense_bin_mask(lat, lon, eps, min_samples):
+    """
+    Flag the points that can end up in a DBSCAN cluster, using an eps-sized grid.
+    
+    Every eps-neighbour of a point lies in its own or an adjacent grid cell, so
+    a point can only be a core point if its 3x3 block of cells holds at least
+    min_samples points, and can only join a cluster if its block contains such
+    a cell. Dropping the remaining points does not change DBSCAN's labels.
+    
+    Args:
+        lat (numpy.ndarray): Latitude values
+        lon (numpy.ndarray): Longitude values
+        eps (float): DBSCAN epsilon parameter
+        min_samples (int): DBSCAN min_samples parameter
+        
+    Returns:
+        numpy.ndarray: Boolean mask of points that may be clustered
+    """
+    # Cells a hair wider than eps so rounding never splits neighbours two cells apart
+    cell = eps * (1 + 1e-6)
+    ix = np.floor(lat / cell).astype(np.int64)
+    iy = np.floor(lon / cell).astype(np.int64)
+    keys, first, inverse, counts = np.unique(
+        (ix << 32) | (iy & 0xffffffff), return_index=True, return_inverse=True, return_counts=True
+    )
+    bin_x, bin_y = ix[first], iy[first]
+    
+    # Position of each of the 9 surrounding cells in keys, and whether it is occupied
+    neighbours = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour_keys = ((bin_x + dx) << 32) | ((bin_y + dy) & 0xffffffff)
+            pos = np.minimum(np.searchsorted(keys, neighbour_keys), keys.size - 1)
+            neighbours.append((pos, keys[pos] == neighbour_keys))
+    
+    block_counts = np.zeros(keys.size, dtype=np.int64)
+    for pos, occupied in neighbours:
+        block_counts += np.where(occupied, counts[pos], 0)
+    dense = block_counts >= min_samples
+    
+    near_dense = np.zeros(keys.size, dtype=bool)
+    for pos, occupied in neighbours:
+        near_dense |= occupied & dense[pos]
+    return near_dense[inverse.ravel()]
+
+def _dbscan_labels(coords, eps, min_samples, n_tiles=(4, 4)):
+    """
+    Run DBSCAN on a coordinate matrix, splitting large inputs into tiles.
+    
+    Points in sparse areas of the eps grid are labelled as noise up front and
+    never reach DBSCAN.
+    
+    Args:
+        coords (numpy.ndarray): Coordinate matrix with latitude and longitude as the first two columns
+        eps (float): DBSCAN epsilon parameter
+        min_samples (int): DBSCAN min_samples parameter
+        n_tiles (tuple): Number of (latitude, longitude) tiles for large inputs
+        
+    Returns:
+        numpy.ndarray: Cluster label for each row, -1 for noise
+    """
+    from sklearn.cluster import DBSCAN
+    
+    labels = np.full(len(coords), -1, dtype=np.int64)
+    if len(coords) == 0:
+        return labels
+    
+    candidates = _dense_bin_mask(coords[:, 0], coords[:, 1], eps, min_samples)
+    n_candidates = int(candidates.sum())
+    if n_candidates == 0:
+        return labels
+    if n_candidates < len(coords):
+        coords = coords[candidates]
+    
+    if n_candidates < TILED_DBSCAN_MIN_POINTS:
+        # Untiled inputs still spread the neighbour queries over all cores
+        labels[candidates] = DBSCAN(eps=eps, min_samples=min_samples, n_jobs=-1).fit(coords).labels_
+    else:
+        labels[candidates] = _tiled_dbscan_labels(coords, eps, min_samples, n_tiles)
+    return labels
+
+def _tiled_dbscan_labels(coords, eps, min_samples, n_tiles=(4, 4)):
+    """
+    Cluster a coordinate matrix by running DBSCAN per spatial tile in parallel.
+    
+    Each tile is clustered together with an eps-wide halo of its neighbours,
+    so the core status of the points it owns is exact. Tile clusters that
+    share a core point are then stitched together with connected components.
+    
+    Args:
+        coords (numpy.ndarray): Coordinate matrix with latitude and longitude as the first two columns
+        eps (float): DBSCAN epsilon parameter
+        min_samples (int): DBSCAN min_samples parameter
+        n_tiles (tuple): Number of (latitude, longitude) tiles
+        
+    Returns:
+        numpy.ndarray: Cluster label for each row, -1 for noise
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from sklearn.cluster import DBSCAN
+    
+    n_points = len(coords)
+    n_rows, n_cols = n_tiles
+    lat, lon = coords[:, 0], coords[:, 1]
+    lat_edges = np.linspace(lat.min(), lat.max(), n_rows + 1)
+    lon_edges = np.linspace(lon.min(), lon.max(), n_cols + 1)
+    
+    # Each point is owned by exactly one tile
+    owner_row = np.clip(np.searchsorted(lat_edges, lat, side='right') - 1, 0, n_rows - 1)
+    owner_col = np.clip(np.searchsorted(lon_edges, lon, side='right') - 1, 0, n_cols - 1)
+    owner = owner_row * n_cols + owner_col
+    
+    # Tile members are the points inside the tile widened by eps on every side
+    tiles = []
+    for row in range(n_rows):
+        in_row = (lat >= lat_edges[row] - eps) & (lat <= lat_edges[row + 1] + eps)
+        for col in range(n_cols):
+            in_tile = in_row & (lon >= lon_edges[col] - eps) & (lon <= lon_edges[col + 1] + eps)
+            members = np.flatnonzero(in_tile)
+            if members.size:
+                tiles.append((row * n_cols + col, members))
+    
+    def cluster_tile(tile):
+        tile_id, members = tile
+        clustering = DBSCAN(eps=eps, min_samples=min_samples).fit(coords[members])
+        is_core = np.zeros(members.size, dtype=bool)
+        is_core[clustering.core_sample_indices_] = True
+        return tile_id, members, clustering.labels_, is_core
+    
+    with ThreadPoolExecutor(max_workers=min(len(tiles), os.cpu_count() or 1)) as executor:
+        tile_results = list(executor.map(cluster_tile, tiles))
+    
+    # Give every tile-local cluster a global id
+    point_ids, label_ids, owned, core = [], [], [], []
+    n_labels = 0
+    for tile_id, members, labels, is_core in tile_results:
+        clustered = labels >= 0
+        if not clustered.any():
+            continue
+        point_ids.append(members[clustered])
+        label_ids.append(labels[clustered] + n_labels)
+        owned.append(owner[members[clustered]] == tile_id)
+        core.append(is_core[clustered])
+        n_labels += labels.max() + 1
+    
+    if n_labels == 0:
+        return np.full(n_points, -1, dtype=np.int64)
+    
+    point_ids = np.concatenate(point_ids)
+    label_ids = np.concatenate(label_ids)
+    owned = np.concatenate(owned)
+    core = np.concatenate(core)
+    
+    # Core status and label come from the owning tile, where the neighbourhood is complete
+    point_label = np.full(n_points, -1, dtype=np.int64)
+    point_label[point_ids[owned]] = label_ids[owned]
+    point_is_core = np.zeros(n_points, dtype=bool)
+    point_is_core[point_ids[owned]] = core[owned]
+    
+    # Border points that only reach a cluster through another tile keep that label
+    unlabelled = point_label[point_ids] < 0
+    point_label[point_ids[unlabelled]] = label_ids[unlabelled]
+    
+    # A core point belongs to one cluster, so every label it carries is the same cluster
+    shared = ~owned & point_is_core[point_ids]
+    graph = coo_matrix(
+        (np.ones(shared.sum(), dtype=np.int8), (point_label[point_ids[shared]], label_ids[shared])),
+        shape=(n_labels, n_labels)
+    )
+    _, merged = connected_components(graph, directed=False)
+    
+    labels = np.full(n_points, -1, dtype=np.int64)
+    clustered = point_label >= 0
+    _, labels[clustered] = np.unique(merged[point_label[clustered]], return_inverse=True)
+    return labels
 
 class FIRMSHandler:
     """Handler for FIRMS API interactions with enhanced functionality"""
@@ -23,6 +509,9 @@ class FIRMSHandler:
         self.session = requests.Session()
         self.session.auth = (username, password)
         self.osm_handler = OSMHandler(verbose=False)
+        self._country_bboxes = COUNTRY_BBOXES
+        self._state_bboxes = US_STATE_BBOXES
+        self._parsed_bbox_cache = {}
 
     def get_country_bbox(self, country):
         """
@@ -34,9 +523,93 @@ class FIRMSHandler:
         Returns:
             str: Bounding box string in format "min_lon,min_lat,max_lon,max_lat"
         """
-        # This large dictionary is moved to settings.py
-        from app.config.settings import COUNTRY_BBOXES
-        return COUNTRY_BBOXES.get(country, None)
+        return self._country_bboxes.get(country, None)
+
+    def _parse_bbox(self, bbox):
+        """
+        Parse a bounding box string into floats, caching the result.
+        
+        Args:
+            bbox (str): Bounding box string in format "min_lon,min_lat,max_lon,max_lat"
+            
+        Returns:
+            tuple: Parsed bounding box coordinates
+        """
+        bbox_coords = self._parsed_bbox_cache.get(bbox)
+        if bbox_coords is None:
+            bbox_coords = tuple(float(coord) for coord in bbox.split(','))
+            self._parsed_bbox_cache[bbox] = bbox_coords
+        return bbox_coords
+
+    def _probe_rows(self, url):
+        """
+        Sniff the head of a FIRMS response to see whether it holds any records.
+        
+        Only the first PROBE_BYTES of the body are requested and read, which is
+        enough for the CSV header and the first few rows.
+        
+        Args:
+            url (str): FIRMS API URL to probe
+            
+        Returns:
+            tuple: (number of rows seen or None if the response is invalid, decoded head text)
+        """
+        response = self.session.get(
+            url, timeout=15, headers={'Range': f'bytes=0-{PROBE_BYTES - 1}'}, stream=True
+        )
+        try:
+            response.raise_for_status()
+            head = next(response.iter_content(PROBE_BYTES), b'')[:PROBE_BYTES]
+        finally:
+            response.close()
+        
+        text = head.decode('utf-8', errors='replace')
+        if not text.strip() or "Invalid" in text or "Error" in text:
+            return None, text
+        # The header is the first line; a truncated last row still counts as a record
+        return len(text.splitlines()) - 1, text
+
+    def _fetch_chunks(self, chunk_requests, timeout, progress_bar, status_text):
+        """
+        Fetch date chunks concurrently and collect their frames in request order.
+        
+        Requests run on a thread pool sharing the handler's session, while
+        progress updates and warnings stay on the calling script thread.
+        
+        Args:
+            chunk_requests (list): (description, url, chunk_start_str, chunk_end_str) tuples
+            timeout (int): Request timeout in seconds
+            progress_bar: Streamlit progress bar to update
+            status_text: Streamlit placeholder for the current chunk
+        
+        Returns:
+            tuple: (list of non-empty chunk frames, number of chunks that failed)
+        """
+        def fetch(url):
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return _read_csv_response(response)
+        
+        chunk_frames = []
+        failed_chunks = 0
+        if not chunk_requests:
+            return chunk_frames, failed_chunks
+        
+        with ThreadPoolExecutor(max_workers=min(FETCH_MAX_WORKERS, len(chunk_requests))) as executor:
+            futures = [executor.submit(fetch, url) for _, url, _, _ in chunk_requests]
+            for i, (future, request) in enumerate(zip(futures, chunk_requests)):
+                description, _, chunk_start_str, chunk_end_str = request
+                status_text.write(f"Fetching {description}: {chunk_start_str} to {chunk_end_str}")
+                progress_bar.progress(i / len(chunk_requests))
+                try:
+                    chunk_df = future.result()
+                    # Only process non-empty results
+                    if chunk_df is not None and not chunk_df.empty:
+                        _collect_chunk(chunk_frames, chunk_df, chunk_start_str, chunk_end_str)
+                except Exception as e:
+                    failed_chunks += 1
+                    st.warning(f"Error processing {description}: {str(e)}")
+        return chunk_frames, failed_chunks
 
     def _apply_dbscan(self, df, eps=0.01, min_samples=5, bbox=None, max_time_diff_days=5):
         """
@@ -52,41 +625,33 @@ class FIRMSHandler:
         Returns:
             pandas.DataFrame: DataFrame with cluster labels
         """
-        from sklearn.cluster import DBSCAN
-        
         # Early exit if not enough points
         if len(df) < min_samples:
             st.warning(f"Too few points ({len(df)}) for clustering. Minimum required: {min_samples}")
             # Add cluster label column filled with noise indicator (-1)
-            df['cluster'] = -1
+            df['cluster'] = np.int32(-1)
             return df
         
-        # First filter the data by bounding box if provided
+        # Filter the data by bounding box if provided, working on the raw arrays
+        # so the mask is computed once and the frame is only gathered once
         if bbox:
             # Parse the bbox string to get coordinates
-            bbox_coords = [float(coord) for coord in bbox.split(',')]
+            bbox_coords = self._parse_bbox(bbox)
             if len(bbox_coords) == 4:  # min_lon, min_lat, max_lon, max_lat
-                min_lon, min_lat, max_lon, max_lat = bbox_coords
-                
-                # Filter dataframe to only include points within the bounding box
-                bbox_mask = (
-                    (df['longitude'] >= min_lon) & 
-                    (df['longitude'] <= max_lon) & 
-                    (df['latitude'] >= min_lat) & 
-                    (df['latitude'] <= max_lat)
+                keep = _bbox_indices(
+                    df['longitude'].to_numpy(), df['latitude'].to_numpy(), bbox_coords
                 )
                 
-                filtered_df = df[bbox_mask].copy()
-#                st.info(f"Filtered data to {len(filtered_df)} points within the selected country boundaries.")
-                
                 # If filtering resulted in too few points, return the filtered df without clustering
-                if len(filtered_df) < min_samples:
+                if keep.size < min_samples:
+                    filtered_df = df.take(keep)
                     st.warning(f"Too few points within country boundaries ({len(filtered_df)}) for clustering. Minimum required: {min_samples}")
                     # Mark all as noise
-                    filtered_df['cluster'] = -1
+                    filtered_df['cluster'] = np.int32(-1)
                     return filtered_df
                 
-                df = filtered_df
+                if keep.size < len(df):
+                    df = df.take(keep)
         
         # Check date column format and standardize if needed
         date_col = None
@@ -97,8 +662,8 @@ class FIRMSHandler:
         
         if date_col:
             # Convert date to datetime if it's not already
-            if df[date_col].dtype != 'datetime64[ns]':
-                df[date_col] = pd.to_datetime(df[date_col])
+            if not is_datetime64_any_dtype(df[date_col]):
+                df[date_col] = pd.to_datetime(df[date_col], format='%Y-%m-%d', cache=True)
             
             # Create day number from min date for temporal clustering
             min_date = df[date_col].min()
@@ -110,20 +675,24 @@ class FIRMSHandler:
             day_scale = 0.001  # Small weight to time dimension
             
             # Create 3D coordinates: (lat, lon, scaled_day)
-            coords = df[['latitude', 'longitude']].copy()
-            coords['scaled_day'] = df['day_num'] * day_scale * max_time_diff_days  # Adjust scale by max days
-            
-            # Apply DBSCAN on 3D coordinates
-            clustering = DBSCAN(eps=eps, min_samples=min_samples).fit(coords)
+            coords = _build_cluster_coords(
+                df['latitude'].to_numpy(),
+                df['longitude'].to_numpy(),
+                df['day_num'].to_numpy(),
+                day_scale * max_time_diff_days  # Adjust scale by max days
+            )
         else:
             # If no date column, just use standard 2D clustering
-            coords = df[['latitude', 'longitude']].values
-            clustering = DBSCAN(eps=eps, min_samples=min_samples).fit(coords)
+            coords = _build_cluster_coords(df['latitude'].to_numpy(), df['longitude'].to_numpy())
         
-        df['cluster'] = clustering.labels_
+        # Apply DBSCAN on the prepared coordinates, tiling large inputs
+        labels = _dbscan_labels(coords, eps, min_samples)
         
-        n_clusters = len(set(clustering.labels_)) - (1 if -1 in clustering.labels_ else 0)
-        n_noise = list(clustering.labels_).count(-1)
+        df['cluster'] = labels.astype(np.int32, copy=False)
+        
+        n_noise = int((labels == -1).sum())
+        unique_labels = np.unique(labels)
+        n_clusters = unique_labels.size - (1 if unique_labels.size and unique_labels[0] == -1 else 0)
         
         st.write(f"Number of clusters found: {n_clusters}")
         st.write(f"Number of noise points: {n_noise}")
@@ -150,22 +719,6 @@ class FIRMSHandler:
         """
         Fetch and process fire data from FIRMS API with support for historical data.
         """
-        # Import dataset availability info from settings
-        try:
-            from app.config.settings import DATASET_AVAILABILITY
-        except ImportError:
-            # Fallback if not available in settings - UPDATE THESE DATES
-            DATASET_AVAILABILITY = {
-                'MODIS_NRT': {'min_date': '2024-12-01', 'max_date': '2025-03-24'},
-                'MODIS_SP': {'min_date': '2000-11-01', 'max_date': '2024-12-31'},
-                'VIIRS_NOAA20_NRT': {'min_date': '2024-12-01', 'max_date': '2025-03-24'},
-                'VIIRS_NOAA20_SP': {'min_date': '2018-04-01', 'max_date': '2025-03-24'},  # Updated end date
-                'VIIRS_NOAA21_NRT': {'min_date': '2024-01-17', 'max_date': '2025-03-24'},
-                'VIIRS_SNPP_NRT': {'min_date': '2025-01-01', 'max_date': '2025-03-24'},
-                'VIIRS_SNPP_SP': {'min_date': '2012-01-20', 'max_date': '2025-03-24'},  # Updated end date
-                'LANDSAT_NRT': {'min_date': '2022-06-20', 'max_date': '2025-03-24'}
-            }
-        
         # Determine if we need historical data
         today = datetime.now().date()
         
@@ -237,8 +790,7 @@ class FIRMSHandler:
                 
         # Check if the requested date range is available for this dataset
         if dataset in DATASET_AVAILABILITY:
-            min_date = datetime.strptime(DATASET_AVAILABILITY[dataset]['min_date'], '%Y-%m-%d').date()
-            max_date = datetime.strptime(DATASET_AVAILABILITY[dataset]['max_date'], '%Y-%m-%d').date()
+            min_date, max_date = DATASET_DATE_WINDOWS[dataset]
                     
             if start_date_date < min_date:
                 st.warning(f"Start date {start_date_date} is before the earliest available date ({min_date}) for {dataset}. Using earliest available date.")
@@ -254,8 +806,7 @@ class FIRMSHandler:
         if not bbox:
             if country == "United States" and state and state != "All States":
                 # Use state bbox if selected
-                from app.config.settings import US_STATE_BBOXES
-                bbox = US_STATE_BBOXES.get(state, None)
+                bbox = self._state_bboxes.get(state, None)
                 st.info(f"Using bounding box for {state}: {bbox}")
             elif country:
                 # Use country bbox
@@ -282,13 +833,11 @@ class FIRMSHandler:
         st.write(f"Debug - Testing API availability with: {test_url}")
         
         try:
-            test_response = self.session.get(test_url, timeout=60)
-            test_response.raise_for_status()
+            test_rows, test_head = self._probe_rows(test_url)
             
-            if test_response.text.strip() and "Invalid" not in test_response.text and "Error" not in test_response.text:
-                test_df = pd.read_csv(StringIO(test_response.text))
-                if len(test_df) > 0:
-                    st.write(f"Debug - Test API call successful - found {len(test_df)} records")
+            if test_rows is not None:
+                if test_rows > 0:
+                    st.write(f"Debug - Test API call successful - found {test_rows} records in the first {PROBE_BYTES} bytes")
                 else:
                     st.write("Debug - Test API call returned empty dataset")
                     # If using historical dataset, try with NRT dataset as a fallback for recent dates
@@ -298,57 +847,19 @@ class FIRMSHandler:
                         test_url = f"{self.base_url}{self.api_key}/{dataset}/{bbox}/7/{test_date.strftime('%Y-%m-%d')}"
                         st.write(f"Debug - Testing original dataset API: {test_url}")
                         
-                        test_response = self.session.get(test_url, timeout=60)
-                        test_response.raise_for_status()
+                        test_rows, test_head = self._probe_rows(test_url)
                         
-                        if test_response.text.strip() and "Invalid" not in test_response.text and "Error" not in test_response.text:
-                            test_df = pd.read_csv(StringIO(test_response.text))
-                            if len(test_df) > 0:
-                                st.write(f"Debug - Original dataset test successful - found {len(test_df)} records")
+                        if test_rows is not None:
+                            if test_rows > 0:
+                                st.write(f"Debug - Original dataset test successful - found {test_rows} records in the first {PROBE_BYTES} bytes")
                             else:
                                 st.warning(f"No fire data available for {country or 'selected region'} in the selected date range and datasets.")
                                 return None
             else:
-                st.write(f"Debug - Test API call invalid response: {test_response.text[:100]}")
+                st.write(f"Debug - Test API call invalid response: {test_head[:100]}")
         except Exception as e:
             st.write(f"Debug - Test API call failed: {str(e)}")
         
-        # Create date chunks
-        date_chunks = []
-        current_date = start_date_date
-        while current_date <= end_date_date:
-            chunk_end = min(current_date + timedelta(days=min(10, chunk_days)-1), end_date_date)
-            date_chunks.append((current_date, chunk_end))
-            current_date = chunk_end + timedelta(days=1)
-        
-        # Set up progress tracking
-        st.write(f"Processing data in {len(date_chunks)} chunks...")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Initialize combined results
-        all_results = pd.DataFrame()
-        
-        # Debug output for first few chunks
-        for i, (chunk_start, chunk_end) in enumerate(date_chunks[:3]):
-            st.write(f"Debug - Chunk {i+1}: {chunk_start} to {chunk_end}")
-            if i >= 2:  # Only show first 3 chunks
-                break
-
-        if not bbox:
-            if country == "United States" and state and state != "All States":
-                # Use state bbox if selected
-                from app.config.settings import US_STATE_BBOXES
-                bbox = US_STATE_BBOXES.get(state, None)
-                st.info(f"Using bounding box for {state}: {bbox}")
-            elif country:
-                # Use country bbox
-                bbox = self.get_country_bbox(country)
-                    
-            if not bbox:
-                st.error("Provide a country or bounding box")
-                return None
-                
         # Convert dates to strings
         start_date_str = start_date_date.strftime('%Y-%m-%d')
         end_date_str = end_date_date.strftime('%Y-%m-%d')
@@ -369,196 +880,61 @@ class FIRMSHandler:
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        # Initialize combined results
-        all_results = pd.DataFrame()
+        # Debug output for first few chunks
+        for i, (chunk_start, chunk_end) in enumerate(date_chunks[:3]):
+            st.write(f"Debug - Chunk {i+1}: {chunk_start} to {chunk_end}")
+        
+        def chunk_request(description, chunk_bbox, chunk_start, chunk_end):
+            chunk_start_str = chunk_start.strftime('%Y-%m-%d')
+            days_in_chunk = (chunk_end - chunk_start).days + 1
+            url = f"{self.base_url}{self.api_key}/{dataset}/{chunk_bbox}/{days_in_chunk}/{chunk_start_str}"
+            return (description, url, chunk_start_str, chunk_end.strftime('%Y-%m-%d'))
         
         # Special handling for large countries
         large_countries = ['United States', 'China', 'Russia', 'Canada', 'Brazil', 'Australia', 'India']
+        timeout = 60
         if country in large_countries:
             st.warning(f"Consider using your own FIRMS API key for faster results.")
+            timeout = 120  # Longer timeout for large countries
+        
+        # Special handling for Russia which is particularly large
+        if country == 'Russia':
+            st.info("Russia is very large. Dividing into smaller regions for better performance...")
+            timeout = 45  # Shorter timeout for the smaller regions
             
-            # Special handling for Russia which is particularly large
-            if country == 'Russia':
-                st.info("Russia is very large. Dividing into smaller regions for better performance...")
-                
-                # Process western Russia
-                west_bbox = '19.25,41.151,60.0,81.2'
-                st.write("Processing Western Russia...")
-                for i, (chunk_start, chunk_end) in enumerate(date_chunks):
-                    chunk_start_str = chunk_start.strftime('%Y-%m-%d')
-                    chunk_end_str = chunk_end.strftime('%Y-%m-%d')
-                    status_text.write(f"Western Region - Chunk {i+1}/{len(date_chunks)}: {chunk_start_str} to {chunk_end_str}")
-                    progress_bar.progress((i) / (len(date_chunks) * 3))  # 3 regions
-                    
-                    
-                    days_in_chunk = (chunk_end - chunk_start).days + 1
-                    if need_historical:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{west_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    else:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{west_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    
-                    try:
-                        response = self.session.get(url, timeout=45)  # Shorter timeout
-                        response.raise_for_status()
-                        if response.text.strip() and "Invalid" not in response.text:
-                            chunk_df = pd.read_csv(StringIO(response.text))
-                            if not chunk_df.empty:
-                                date_mask = (chunk_df['acq_date'] >= chunk_start_str) & (chunk_df['acq_date'] <= chunk_end_str)
-                                filtered_chunk = chunk_df[date_mask].copy()
-                                if not filtered_chunk.empty:
-                                    all_results = pd.concat([all_results, filtered_chunk], ignore_index=True)
-                    except Exception as e:
-                        st.warning(f"Error processing Western Russia chunk {i+1}: {str(e)}")
-                
-                # Process central Russia
-                central_bbox = '60.0,41.151,120.0,81.2'
-                st.write("Processing Central Russia...")
-                for i, (chunk_start, chunk_end) in enumerate(date_chunks):
-                    chunk_start_str = chunk_start.strftime('%Y-%m-%d')
-                    chunk_end_str = chunk_end.strftime('%Y-%m-%d')
-                    status_text.write(f"Central Region - Chunk {i+1}/{len(date_chunks)}: {chunk_start_str} to {chunk_end_str}")
-                    progress_bar.progress((len(date_chunks) + i) / (len(date_chunks) * 3))
-                    
-                    days_in_chunk = (chunk_end - chunk_start).days + 1
-                    if need_historical:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{central_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    else:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{central_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    
-                    try:
-                        response = self.session.get(url, timeout=45)  # Shorter timeout
-                        response.raise_for_status()
-                        if response.text.strip() and "Invalid" not in response.text:
-                            chunk_df = pd.read_csv(StringIO(response.text))
-                            if not chunk_df.empty:
-                                date_mask = (chunk_df['acq_date'] >= chunk_start_str) & (chunk_df['acq_date'] <= chunk_end_str)
-                                filtered_chunk = chunk_df[date_mask].copy()
-                                if not filtered_chunk.empty:
-                                    all_results = pd.concat([all_results, filtered_chunk], ignore_index=True)
-                    except Exception as e:
-                        st.warning(f"Error processing Central Russia chunk {i+1}: {str(e)}")
-                
-                # Process eastern Russia
-                east_bbox = '120.0,41.151,180.0,81.2'
-                st.write("Processing Eastern Russia...")
-                for i, (chunk_start, chunk_end) in enumerate(date_chunks):
-                    chunk_start_str = chunk_start.strftime('%Y-%m-%d')
-                    chunk_end_str = chunk_end.strftime('%Y-%m-%d')
-                    status_text.write(f"Eastern Region - Chunk {i+1}/{len(date_chunks)}: {chunk_start_str} to {chunk_end_str}")
-                    progress_bar.progress((2 * len(date_chunks) + i) / (len(date_chunks) * 3))
-                    
-                    days_in_chunk = (chunk_end - chunk_start).days + 1
-                    if need_historical:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{east_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    else:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{east_bbox}/{days_in_chunk}/{chunk_start_str}"
-                    
-                    try:
-                        response = self.session.get(url, timeout=45)  # Shorter timeout
-                        response.raise_for_status()
-                        if response.text.strip() and "Invalid" not in response.text:
-                            chunk_df = pd.read_csv(StringIO(response.text))
-                            if not chunk_df.empty:
-                                date_mask = (chunk_df['acq_date'] >= chunk_start_str) & (chunk_df['acq_date'] <= chunk_end_str)
-                                filtered_chunk = chunk_df[date_mask].copy()
-                                if not filtered_chunk.empty:
-                                    all_results = pd.concat([all_results, filtered_chunk], ignore_index=True)
-                    except Exception as e:
-                        st.warning(f"Error processing Eastern Russia chunk {i+1}: {str(e)}")
-            else:
-                # For other large countries, use standard approach with longer timeout
-                self.session.timeout = 120  # Increase timeout to 2 minutes
-                
-                # Standard chunked processing for other large countries
-                for i, (chunk_start, chunk_end) in enumerate(date_chunks):
-                    chunk_start_str = chunk_start.strftime('%Y-%m-%d')
-                    chunk_end_str = chunk_end.strftime('%Y-%m-%d')
-                    
-                    # Update progress
-                    status_text.write(f"Fetching chunk {i+1}/{len(date_chunks)}: {chunk_start_str} to {chunk_end_str}")
-                    progress_bar.progress((i) / len(date_chunks))
-                    
-                    # Get the number of days in this chunk
-                    days_in_chunk = (chunk_end - chunk_start).days + 1
-                    
-                    # Format API URL based on historical data approach
-                    if need_historical:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{bbox}/{days_in_chunk}/{chunk_start_str}"
-                    else:
-                        if i == 0 and len(date_chunks) == 1 and days_in_chunk <= 7:
-                            url = f"{self.base_url}{self.api_key}/{original_dataset}/{bbox}/7"
-                        else:
-                            url = f"{self.base_url}{self.api_key}/{dataset}/{bbox}/{days_in_chunk}/{chunk_start_str}"
-                    
-                    try:
-                        # Fetch data for this chunk
-                        response = self.session.get(url, timeout=120)  # Longer timeout for large countries
-                        response.raise_for_status()
-                        
-                        # Parse CSV data if valid
-                        if response.text.strip() and "Invalid" not in response.text and "Error" not in response.text:
-                            chunk_df = pd.read_csv(StringIO(response.text))
-                            
-                            # Only process non-empty results
-                            if not chunk_df.empty:
-                                # Filter to ensure records are within the requested date range
-                                if 'acq_date' in chunk_df.columns:
-                                    date_mask = (chunk_df['acq_date'] >= chunk_start_str) & (chunk_df['acq_date'] <= chunk_end_str)
-                                    filtered_chunk = chunk_df[date_mask].copy()
-                                    if not filtered_chunk.empty:
-                                        all_results = pd.concat([all_results, filtered_chunk], ignore_index=True)
-                                else:
-                                    all_results = pd.concat([all_results, chunk_df], ignore_index=True)
-                    except Exception as e:
-                        st.warning(f"Error processing chunk {i+1}: {str(e)}")
+            # Flatten every (region, chunk) pair into a single request list. Regions
+            # are not probed first: a probe costs the server as much as the chunk
+            # itself, and empty chunks are simply dropped by _fetch_chunks
+            chunk_requests = [
+                chunk_request(f"{region_name} Russia chunk {i+1}/{len(date_chunks)}", region_bbox, chunk_start, chunk_end)
+                for region_name, region_bbox in RUSSIA_REGIONS
+                for i, (chunk_start, chunk_end) in enumerate(date_chunks)
+            ]
         else:
-            # Standard chunked processing for normal countries
-            for i, (chunk_start, chunk_end) in enumerate(date_chunks):
-                chunk_start_str = chunk_start.strftime('%Y-%m-%d')
-                chunk_end_str = chunk_end.strftime('%Y-%m-%d')
-                
-                # Update progress
-                status_text.write(f"Fetching chunk {i+1}/{len(date_chunks)}: {chunk_start_str} to {chunk_end_str}")
-                progress_bar.progress((i) / len(date_chunks))
-                
-                # Get the number of days in this chunk
-                days_in_chunk = (chunk_end - chunk_start).days + 1
-                
-                # Format API URL based on historical data approach
-                if need_historical:
-                    url = f"{self.base_url}{self.api_key}/{dataset}/{bbox}/{days_in_chunk}/{chunk_start_str}"
-                else:
-                    if i == 0 and len(date_chunks) == 1 and days_in_chunk <= 7:
-                        url = f"{self.base_url}{self.api_key}/{original_dataset}/{bbox}/7"
-                    else:
-                        url = f"{self.base_url}{self.api_key}/{dataset}/{bbox}/{days_in_chunk}/{chunk_start_str}"
-                
-                try:
-                    # Fetch data for this chunk
-                    response = self.session.get(url, timeout=60)
-                    response.raise_for_status()
-                    
-                    # Parse CSV data if valid
-                    if response.text.strip() and "Invalid" not in response.text and "Error" not in response.text:
-                        chunk_df = pd.read_csv(StringIO(response.text))
-                        
-                        # Only process non-empty results
-                        if not chunk_df.empty:
-                            # Filter to ensure records are within the requested date range
-                            if 'acq_date' in chunk_df.columns:
-                                date_mask = (chunk_df['acq_date'] >= chunk_start_str) & (chunk_df['acq_date'] <= chunk_end_str)
-                                filtered_chunk = chunk_df[date_mask].copy()
-                                if not filtered_chunk.empty:
-                                    all_results = pd.concat([all_results, filtered_chunk], ignore_index=True)
-                            else:
-                                all_results = pd.concat([all_results, chunk_df], ignore_index=True)
-                except Exception as e:
-                    st.warning(f"Error processing chunk {i+1}: {str(e)}")
-        
+            chunk_requests = [
+                chunk_request(f"chunk {i+1}/{len(date_chunks)}", bbox, chunk_start, chunk_end)
+                for i, (chunk_start, chunk_end) in enumerate(date_chunks)
+            ]
+            # A single recent chunk uses the plain last-7-days endpoint
+            if not need_historical and len(date_chunks) == 1 and (end_date_date - start_date_date).days < 7:
+                description, _, chunk_start_str, chunk_end_str = chunk_requests[0]
+                url = f"{self.base_url}{self.api_key}/{original_dataset}/{bbox}/7"
+                chunk_requests[0] = (description, url, chunk_start_str, chunk_end_str)
+        
+        # Fetch the chunks concurrently and concatenate them once at the end
+        chunk_frames, failed_chunks = self._fetch_chunks(chunk_requests, timeout, progress_bar, status_text)
+
         # Clean up progress indicators
         progress_bar.progress(1.0)
         status_text.empty()
         
+        all_results = pd.concat(chunk_frames, ignore_index=True) if chunk_frames else pd.DataFrame()
+        all_results = _drop_duplicate_detections(all_results)
+        
+        # Parse acquisition dates once so filtering and grouping compare datetimes
+        if 'acq_date' in all_results.columns:
+            all_results['acq_date'] = pd.to_datetime(all_results['acq_date'], format='%Y-%m-%d', cache=True)
+        
         # Check if we got any data
         if all_results.empty:
             st.warning(f"No records found for {category} in {country or 'selected region'} for the selected date range")
@@ -567,75 +943,39 @@ class FIRMSHandler:
         # Apply bbox filtering to make sure points are within country boundaries
         if bbox and not all_results.empty:
             # Parse the bbox string to get coordinates
-            bbox_coords = [float(coord) for coord in bbox.split(',')]
+            bbox_coords = self._parse_bbox(bbox)
             if len(bbox_coords) == 4:  # min_lon, min_lat, max_lon, max_lat
-                min_lon, min_lat, max_lon, max_lat = bbox_coords
-                
-                # Filter dataframe to only include points within the bounding box
-                bbox_mask = (
-                    (all_results['longitude'] >= min_lon) & 
-                    (all_results['longitude'] <= max_lon) & 
-                    (all_results['latitude'] >= min_lat) & 
-                    (all_results['latitude'] <= max_lat)
-                )
-                
-                filtered_df = all_results[bbox_mask].copy()
-#                st.info(f"Filtered data to {len(filtered_df)} points within the selected country boundaries.")
+                # Find the points within the bounding box
+                lon = all_results['longitude'].to_numpy()
+                lat = all_results['latitude'].to_numpy()
+                keep = _bbox_indices(lon, lat, bbox_coords)
+#                st.info(f"Filtered data to {len(keep)} points within the selected country boundaries.")
                 
-                if len(filtered_df) == 0:
+                if len(keep) == 0:
                     st.warning(f"No points found within the specified bounding box for {country or 'selected region'}.")
                     return None
                 
-                all_results = filtered_df
-                bbox_filtered_results = all_results.copy()
-        
                 if use_strict_country_filtering and country:
-                    try:
-                        from app.config.settings import get_country_geojson
-                        import shapely.geometry as sg
-                        from shapely.geometry import Point, shape
-                        
-                        # Get the country GeoJSON
-                        country_geojson = get_country_geojson(country)
-                        
-                        if country_geojson:
-                            # Convert to shapely geometry
-                            country_polygon = None
-                            if 'features' in country_geojson:
-                                # Multiple features case
-                                for feature in country_geojson['features']:
-                                    if feature['geometry']['type'] in ['Polygon', 'MultiPolygon']:
-                                        poly = shape(feature['geometry'])
-                                        if country_polygon is None:
-                                            country_polygon = poly
-                                        else:
-                                            country_polygon = country_polygon.union(poly)
-                            else:
-                                # Single geometry case
-                                country_polygon = shape(country_geojson['geometry'])
-                            
-                            # Filter points to only those inside the country polygon
-                            initial_count = len(all_results)
-                            points_in_country = []
-                            
-                            for idx, row in all_results.iterrows():
-                                point = Point(row['longitude'], row['latitude'])
-                                if country_polygon.contains(point):
-                                    points_in_country.append(idx)
-                            
-                            if points_in_country:
-                                all_results = all_results.loc[points_in_country].copy()
-                                st.success(f"Strict filtering applied: {len(all_results)} points within actual {country} borders (removed {initial_count - len(all_results)} points outside borders).")
-                            else:
-                                st.warning(f"No points found within the actual borders of {country} with strict filtering.")
-                                # IMPORTANT: Use the bbox filtered results instead
-                                all_results = bbox_filtered_results
-                    except ImportError:
+                    if not HAVE_SHAPELY:
                         st.warning("Shapely library not installed. Cannot apply strict country filtering.")
-                        # Use bbox filtered results as fallback
-                        all_results = bbox_filtered_results
-                    except Exception as e:
-                        st.warning(f"Could not apply strict country filtering: {str(e)}")
+                        # The bbox filtered results are kept as fallback
+                    else:
+                        try:
+                            # Test only the bbox survivors, so the frame is gathered once
+                            points_in_country = _country_mask(country, lon[keep], lat[keep], bbox_coords)
+                            
+                            if points_in_country is not None:
+                                if points_in_country.any():
+                                    initial_count = len(keep)
+                                    keep = keep[points_in_country]
+                                    st.success(f"Strict filtering applied: {len(keep)} points within actual {country} borders (removed {initial_count - len(keep)} points outside borders).")
+                                else:
+                                    st.warning(f"No points found within the actual borders of {country} with strict filtering.")
+                                    # IMPORTANT: Keep the bbox filtered results instead
+                        except Exception as e:
+                            st.warning(f"Could not apply strict country filtering: {str(e)}")
+                
+                all_results = all_results.take(keep)
                     
         # Apply clustering to the results if needed
         if use_clustering and not all_results.empty:
@@ -643,7 +983,7 @@ class FIRMSHandler:
                                             bbox=bbox, max_time_diff_days=max_time_diff_days)
         elif category == 'raw data':
             # For raw data, just add a cluster column with all points as "noise" (-1)
-            all_results['cluster'] = -1
+            all_results['cluster'] = np.int32(-1)
             st.info("Showing raw data without clustering")
         
         # Apply spatial joins for specific categories
@@ -668,4 +1008,10 @@ class FIRMSHandler:
         st.write("Raw Data Information:")
         st.write(f"Total records: {len(all_results)}")
         
+        # Resolve the temperature column once so UI helpers can reuse it
+        all_results.attrs.pop('temp_col', None)
+        all_results.attrs['temp_col'] = get_temp_column(all_results)
+        # Lets callers tell partial results from complete ones
+        all_results.attrs['failed_chunks'] = failed_chunks
+        
         return all_results
\ No newline at end of file
@@ -145,7 +145,7 @@ class OSMHandler:
         # Create GeoDataFrame from DataFrame
         gdf = gpd.GeoDataFrame(
             df,
-            geometry=[Point(lon, lat) for lon, lat in zip(df['longitude'], df['latitude'])],
+            geometry=gpd.points_from_xy(df['longitude'], df['latitude']),
             crs="EPSG:4326"
         )
         
@@ -189,20 +189,20 @@ class OSMHandler:
                 # Perform spatial join
                 joined = gpd.sjoin(gdf_buffered, osm_gdf, how="left", predicate="intersects")
                 
-                # Update the original GDF with match information
-                for idx, row in joined.iterrows():
-                    if pd.notna(row['id']):
-                        # Calculate distance (approximately)
-                        orig_point = Point(df.loc[idx, 'longitude'], df.loc[idx, 'latitude'])
-                        osm_point = row['geometry_right']
-                        # Simple Euclidean distance (degrees) * 111 km/degree for approximate km
-                        distance = orig_point.distance(osm_point) * 111
-                        
-                        # Update the dataframe
-                        gdf.loc[idx, 'osm_match'] = True
-                        gdf.loc[idx, 'osm_feature_id'] = row['id']
-                        gdf.loc[idx, 'osm_feature_type'] = row['type']
-                        gdf.loc[idx, 'osm_distance_km'] = distance
+                # Keep the last OSM match for each point and update the original GDF in one pass
+                matches = joined[joined['id'].notna()]
+                matches = matches[~matches.index.duplicated(keep='last')]
+                
+                if not matches.empty:
+                    # Simple Euclidean distance (degrees) * 111 km/degree for approximate km
+                    osm_geometry = osm_gdf.geometry.loc[matches['index_right']]
+                    distance = gdf.geometry.loc[matches.index].distance(osm_geometry, align=False) * 111
+                    
+                    # Update the dataframe
+                    gdf.loc[matches.index, 'osm_match'] = True
+                    gdf.loc[matches.index, 'osm_feature_id'] = matches['id']
+                    gdf.loc[matches.index, 'osm_feature_type'] = matches['type']
+                    gdf.loc[matches.index, 'osm_distance_km'] = distance.to_numpy()
         
         # Return the updated DataFrame with OSM join information
         result_df = pd.DataFrame(gdf.drop(columns='geometry'))
@@ -2,6 +2,15 @@
 Utility functions for the Fire Investigation Tool.
 Includes helper functions used across the application.
 """
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# UI names for each category; anything else (e.g. raw data) is shown as a cluster
+CATEGORY_DISPLAY_NAMES = {"fires": "Fire", "flares": "Flare", "volcanoes": "Volcano"}
+CATEGORY_SINGULAR_NAMES = {"fires": "fire", "flares": "flare", "volcanoes": "volcano"}
 
 def get_temp_column(df):
     """
@@ -15,6 +24,11 @@ def get_temp_column(df):
     """
     if df is None:
         return None
+    
+    # Use the column resolved when the data was fetched, if this frame still has
+    # it (attrs also carry over to column subsets that dropped it)
+    if df.attrs.get('temp_col') in df.columns:
+        return df.attrs['temp_col']
         
     if 'bright_ti4' in df.columns:
         return 'bright_ti4'
@@ -33,14 +47,7 @@ def get_category_display_name(category):
     Returns:
         str: Category display name for UI
     """
-    if category == "fires":
-        return "Fire"
-    elif category == "flares":
-        return "Flare"
-    elif category == "volcanoes":
-        return "Volcano"
-    else:
-        return "Cluster"  # Default for raw data
+    return CATEGORY_DISPLAY_NAMES.get(category, "Cluster")  # Default for raw data
 
 def get_category_singular(category):
     """
@@ -52,39 +59,113 @@ def get_category_singular(category):
     Returns:
         str: Singular form of category name
     """
-    if category == "fires":
-        return "fire"
-    elif category == "flares":
-        return "flare"
-    elif category == "volcanoes":
-        return "volcano"
-    else:
-        return "cluster"  # Default for raw data
+    return CATEGORY_SINGULAR_NAMES.get(category, "cluster")  # Default for raw data
+
+def format_date(date):
+    """
+    Format an acquisition date for display.
+    
+    Args:
+        date: Timestamp, numpy datetime64 or date string
+        
+    Returns:
+        str: Date as YYYY-MM-DD
+    """
+    return pd.Timestamp(date).strftime('%Y-%m-%d')
+
+def get_cluster_dates(df):
+    """
+    Collect the sorted unique acquisition dates of every cluster.
+    
+    Results are stored sorted by cluster and date, so the unique dates are
+    read off as runs without sorting again; unsorted input is sorted first.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with cluster labels
+        
+    Returns:
+        dict: Sorted list of dates for each cluster ID
+    """
+    if df is None or df.empty or 'cluster' not in df.columns or 'acq_date' not in df.columns:
+        return {}
+    clusters = df['cluster'].to_numpy()
+    dates = df['acq_date'].to_numpy()
+    
+    same_cluster = clusters[1:] == clusters[:-1]
+    if not ((clusters[1:] >= clusters[:-1]).all() and (dates[1:][same_cluster] >= dates[:-1][same_cluster]).all()):
+        order = np.lexsort((dates, clusters))
+        clusters, dates = clusters[order], dates[order]
+        same_cluster = clusters[1:] == clusters[:-1]
+    
+    # Keep the first row of every (cluster, date) run
+    run_start = np.ones(len(clusters), dtype=bool)
+    run_start[1:] = ~same_cluster | (dates[1:] != dates[:-1])
+    clusters = clusters[run_start]
+    dates = pd.Index(dates[run_start]).tolist()
+    
+    cluster_start = np.flatnonzero(np.r_[True, clusters[1:] != clusters[:-1]])
+    cluster_end = np.r_[cluster_start[1:], len(clusters)]
+    return {
+        clusters[start].item(): dates[start:end]
+        for start, end in zip(cluster_start, cluster_end)
+    }
+
+def get_cluster_playback_dates(cluster_id):
+    """
+    Get the sorted unique dates of a cluster in the current results.
+    
+    Uses the per-cluster dates precomputed when the results were stored,
+    scanning the results only if they are missing.
+    
+    Args:
+        cluster_id (int): Cluster ID
+        
+    Returns:
+        list: Sorted dates on which the cluster was detected
+    """
+    cluster_dates = st.session_state.get('cluster_dates')
+    if cluster_dates is not None:
+        return cluster_dates.get(cluster_id, [])
+    results = st.session_state.results
+    # Timestamps, like the precomputed dates, so both match the date group keys
+    return pd.Index(results.loc[results['cluster'] == cluster_id, 'acq_date'].unique()).sort_values().tolist()
+
+def get_cluster_results(cluster_id):
+    """
+    Get the rows of a cluster in the current results.
+    
+    Uses the per-cluster row positions precomputed when the results were
+    stored, scanning the results only if they are missing.
+    
+    Args:
+        cluster_id (int): Cluster ID
+        
+    Returns:
+        pandas.DataFrame: Rows belonging to the cluster
+    """
+    results = st.session_state.results
+    cluster_rows = st.session_state.get('cluster_rows')
+    if cluster_rows is not None:
+        return results.take(cluster_rows.get(cluster_id, []))
+    return results[results['cluster'] == cluster_id]
 
 def clear_stale_state():
     """
     Clean up any stale state that might be causing issues.
     """
-    import streamlit as st
-    import time
-    
     # Check for and clean up potentially problematic session state
     if "processed_params" in st.session_state:
-        # Clean up old tracked parameters (older than 10 minutes)
-        current_time = time.time()
-        keys_to_remove = []
-        for key, timestamp in st.session_state.processed_params.items():
-            if current_time - timestamp > 600:  # 10 minutes
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del st.session_state.processed_params[key]
-    
-    # Make sure URL parameters are clean
-    if 'selected_cluster' in st.query_params:
-        # If any query params were left over from a previous run,
-        # clear them for a fresh start
-        del st.query_params['selected_cluster']
+        # Keep only tracked parameters from the last 10 minutes
+        cutoff = time.time() - 600
+        st.session_state.processed_params = {
+            key: timestamp
+            for key, timestamp in st.session_state.processed_params.items()
+            if timestamp >= cutoff
+        }
+    
+    # Make sure URL parameters are clean: if any query params were left
+    # over from a previous run, clear them for a fresh start
+    st.query_params.pop('selected_cluster', None)
 
 def handle_url_parameters(category=None):
     """
@@ -93,46 +174,42 @@ def handle_url_parameters(category=None):
     Args:
         category (str, optional): Current category of data
     """
-    import streamlit as st
-    
-    # Check if selected_cluster parameter exists
-    if 'selected_cluster' in st.query_params:
-        try:
-            # Get cluster ID from URL parameters
-            cluster_id = int(st.query_params['selected_cluster'])
-            
-            # Clear the URL parameter immediately to prevent reprocessing
-            del st.query_params['selected_cluster']
-            
-            # Skip further processing if category isn't defined yet
-            if category is None or 'results' not in st.session_state or st.session_state.results is None:
-                return
-                
-            # Check if it's a new selection
-            if st.session_state.get('selected_cluster') != cluster_id:
-                # Update the selected cluster in session state
-                st.session_state.selected_cluster = cluster_id
-                
-                # Get unique dates for the selected cluster
-                cluster_points = st.session_state.results[st.session_state.results['cluster'] == cluster_id]
-                unique_dates = sorted(cluster_points['acq_date'].unique())
-                
-                # Store the dates and initialize to the first one
-                st.session_state.playback_dates = unique_dates
-                st.session_state.playback_index = 0
-                
-                # Enable playback mode when selecting from map
-                st.session_state.playback_mode = True
-                
-                # Update cluster dropdown to match if it exists
-                if 'cluster_select' in st.session_state and 'cluster_options' in st.session_state:
-                    cluster_name = f"{get_category_display_name(category)} {cluster_id}"
-                    if cluster_name in st.session_state['cluster_options']:
-                        st.session_state.cluster_select = cluster_name
-                
-                # Use a safer rerun approach
-                st.rerun()
-        except (ValueError, TypeError):
-            # Invalid cluster ID, ignore it
-            if 'selected_cluster' in st.query_params:
-                del st.query_params['selected_cluster']
\ No newline at end of file
+    # Take the selected_cluster parameter, clearing it immediately to prevent reprocessing
+    raw_cluster_id = st.query_params.pop('selected_cluster', None)
+    if raw_cluster_id is None:
+        return
+    
+    try:
+        # Get cluster ID from URL parameters
+        cluster_id = int(raw_cluster_id)
+    except (ValueError, TypeError):
+        # Invalid cluster ID, ignore it
+        return
+    
+    # Skip further processing if category isn't defined yet
+    if category is None or 'results' not in st.session_state or st.session_state.results is None:
+        return
+        
+    # Check if it's a new selection
+    if st.session_state.get('selected_cluster') != cluster_id:
+        # Update the selected cluster in session state
+        st.session_state.selected_cluster = cluster_id
+        
+        # Get unique dates for the selected cluster
+        unique_dates = get_cluster_playback_dates(cluster_id)
+        
+        # Store the dates and initialize to the first one
+        st.session_state.playback_dates = unique_dates
+        st.session_state.playback_index = 0
+        
+        # Enable playback mode when selecting from map
+        st.session_state.playback_mode = True
+        
+        # Update cluster dropdown to match if it exists
+        if 'cluster_select' in st.session_state and 'cluster_options' in st.session_state:
+            cluster_name = f"{get_category_display_name(category)} {cluster_id}"
+            if cluster_name in st.session_state['cluster_options']:
+                st.session_state.cluster_select = cluster_name
+        
+        # Use a safer rerun approach
+        st.rerun()
@@ -3,21 +3,22 @@ Main Streamlit app for the Fire Analysis Tool.
 Entry point for the application that integrates all components.
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import streamlit.components.v1 as components
 import traceback
+from functools import partial
 
 # Import core modules
-from app.core.firms_handler import FIRMSHandler
-from app.core.analysis import create_cluster_summary, display_feature_exploration, display_coordinate_view, has_multiple_dates
-from app.core.utils import clear_stale_state, handle_url_parameters, get_category_display_name, get_category_singular
+# (the handler, analysis, map and timeline modules pull in sklearn, altair,
+# folium and pydeck, so they are imported where first used to keep the
+# initial page load light)
+from app.core.utils import clear_stale_state, handle_url_parameters, get_category_display_name, get_category_singular, get_cluster_dates, get_cluster_playback_dates, get_cluster_results, format_date
 
 # Import UI modules
-from app.ui.map import plot_fire_detections_folium
 from app.ui.sidebar import render_sidebar_content
-from app.ui.timeline import export_timeline, create_arrow_navigation
-from app.ui.utils import setup_page_config, create_custom_sidebar_js, move_content_to_sidebar_js, custom_css
+from app.ui.utils import setup_page_config, custom_css
 from app.ui.user_guide import USER_GUIDE_MARKDOWN
 
 # Import settings
@@ -34,10 +35,311 @@ from app.config.settings import (
     DEFAULT_DOT_SIZE_MULTIPLIER,
     DEFAULT_COLOR_PALETTE,
     DEFAULT_BASEMAP,
+    WEBGL_MAP_MIN_POINTS,
+    THIN_MAP_MIN_POINTS,
     DEFAULT_EPS,
     DEFAULT_MIN_SAMPLES
 )
 
+# Widget options, built once rather than on every rerun
+COUNTRY_OPTIONS = list(COUNTRY_BBOXES.keys())
+STATE_OPTIONS = list(US_STATE_BBOXES.keys())
+CATEGORY_OPTIONS = ["fires", "flares", "raw data"]
+
+# Dataset checkboxes as (dataset, label, checked by default)
+DATASET_OPTIONS = (
+    ('VIIRS_NOAA20_NRT', "VIIRS NOAA-20", True),
+    ('VIIRS_SNPP_NRT', "VIIRS SNPP", True),
+    ('MODIS_NRT', "MODIS", True),
+)
+
+@st.cache_resource(show_spinner=False)
+def get_firms_handler(username, password, api_key):
+    """
+    Get a FIRMS handler whose HTTP session is shared across reruns.
+    
+    Args:
+        username (str): FIRMS username
+        password (str): FIRMS password
+        api_key (str): FIRMS API key
+        
+    Returns:
+        FIRMSHandler: Handler for these credentials
+    """
+    from app.core.firms_handler import FIRMSHandler
+    
+    return FIRMSHandler(username, password, api_key)
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def fetch_fire_data_cached(username, password, api_key, **fetch_args):
+    """
+    Fetch and cluster FIRMS data, reusing the results for repeated settings.
+    
+    Args:
+        username (str): FIRMS username
+        password (str): FIRMS password
+        api_key (str): FIRMS API key
+        **fetch_args: Arguments passed to FIRMSHandler.fetch_fire_data
+        
+    Returns:
+        pandas.DataFrame: Processed fire data, or None if nothing was found
+    """
+    handler = get_firms_handler(username, password, api_key)
+    return handler.fetch_fire_data(**fetch_args)
+
+def get_cluster_summary(category):
+    """
+    Get the cluster summary table for the current results.
+    
+    The summary is built once per result set and category and kept in
+    session state, so reruns neither rebuild it nor hash the results.
+    
+    Args:
+        category (str): Category of data
+        
+    Returns:
+        pandas.DataFrame: Summary statistics for each cluster
+    """
+    cached = st.session_state.get('cluster_summary')
+    if cached is not None and cached[0] == category:
+        return cached[1]
+    
+    from app.core.analysis import create_cluster_summary
+    
+    cluster_summary = create_cluster_summary(st.session_state.results, category)
+    st.session_state.cluster_summary = (category, cluster_summary)
+    return cluster_summary
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_fire_map_html(results, title, selected_cluster=None, playback_mode=False, playback_date=None,
+                         category="fires", color_palette=DEFAULT_COLOR_PALETTE,
+                         dot_size_multiplier=DEFAULT_DOT_SIZE_MULTIPLIER):
+    """
+    Render the detection map to HTML, reusing it while its inputs are unchanged.
+    
+    Args:
+        results (pandas.DataFrame): DataFrame with fire detection data
+        title (str): Title for the map
+        selected_cluster (int, optional): Selected cluster ID
+        playback_mode (bool): Whether the map shows a single playback date
+        playback_date (str, optional): Date shown in playback mode
+        category (str): Category of data
+        color_palette (str): Color palette for clusters
+        dot_size_multiplier (float): Multiplier for point sizes
+        
+    Returns:
+        str: Map HTML, or None if there is nothing to plot
+    """
+    from app.ui.map import plot_fire_detections_folium
+    
+    folium_map = plot_fire_detections_folium(
+        results,
+        title,
+        selected_cluster,
+        playback_mode,
+        playback_date,
+        category=category,
+        color_palette=color_palette,
+        dot_size_multiplier=dot_size_multiplier
+    )
+    return folium_map._repr_html_() if folium_map else None
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def render_fire_map_deck(results, category="fires", color_palette=DEFAULT_COLOR_PALETTE,
+                         dot_size_multiplier=DEFAULT_DOT_SIZE_MULTIPLIER):
+    """
+    Build the WebGL overview map, reusing it while its inputs are unchanged.
+    
+    Args:
+        results (pandas.DataFrame): DataFrame with fire detection data
+        category (str): Category of data
+        color_palette (str): Color palette for clusters
+        dot_size_multiplier (float): Multiplier for point sizes
+        
+    Returns:
+        pydeck.Deck: Overview map, or None if there is nothing to plot
+    """
+    from app.ui.map import plot_fire_detections_pydeck
+    
+    return plot_fire_detections_pydeck(
+        results,
+        dot_size_multiplier=dot_size_multiplier,
+        color_palette=color_palette,
+        category=category
+    )
+
+def select_cluster_from_deck(category):
+    """
+    Select the cluster of the detection clicked on the WebGL overview map.
+    
+    The cluster is chosen through the sidebar selector, which then updates
+    the selected cluster and its playback dates as for a manual selection.
+    
+    Args:
+        category (str): Category of data
+    """
+    clicked = st.session_state.detection_deck.selection.objects.get('detections', [])
+    if clicked:
+        cluster_name = f"{get_category_display_name(category)} {clicked[0]['cluster']}"
+        if cluster_name in st.session_state.get('cluster_options', []):
+            st.session_state.cluster_select = cluster_name
+
+def get_playback_layers(category, map_settings):
+    """
+    Get the playback map points for every playback date of the selected cluster.
+    
+    The points are built once per cluster and map settings and kept in session
+    state, so stepping through dates only indexes into the list.
+    
+    Args:
+        category (str): Category of data
+        map_settings (dict): Color palette, basemap and dot size settings
+        
+    Returns:
+        tuple: (list of playback_layer_data dicts per date, cluster bounds)
+    """
+    from app.ui.map import playback_layer_data
+    
+    selected_cluster = st.session_state.get('selected_cluster')
+    playback_dates = st.session_state.get('playback_dates', [])
+    color_palette = map_settings.get('color_palette', DEFAULT_COLOR_PALETTE)
+    dot_size_multiplier = map_settings.get('dot_size_multiplier', DEFAULT_DOT_SIZE_MULTIPLIER)
+    
+    playback_key = (selected_cluster, tuple(playback_dates), category, color_palette, dot_size_multiplier)
+    cached = st.session_state.get('playback_layers')
+    if cached is not None and cached[0] == playback_key:
+        return cached[1]
+    
+    # PRE-FILTER the data to only include the selected cluster, then split it by date
+    cluster_filtered_results = get_cluster_results(selected_cluster)
+    date_rows = cluster_filtered_results.groupby('acq_date', sort=False).indices
+    
+    playback_layers = [
+        playback_layer_data(
+            cluster_filtered_results.take(date_rows.get(playback_date, [])),  # ONLY pass the day's rows
+            dot_size_multiplier=dot_size_multiplier,
+            color_palette=color_palette
+        )
+        for playback_date in playback_dates
+    ]
+    
+    # The view is fitted to the whole cluster once, not to every date
+    bounds = None
+    if not cluster_filtered_results.empty:
+        lat = cluster_filtered_results['latitude']
+        lon = cluster_filtered_results['longitude']
+        bounds = [[float(lat.min()), float(lon.min())], [float(lat.max()), float(lon.max())]]
+    
+    st.session_state.playback_layers = (playback_key, (playback_layers, bounds))
+    return playback_layers, bounds
+
+def get_map_results(selected_cluster):
+    """
+    Get the detections drawn on the detection map.
+    
+    A selected cluster's map only shows that cluster, so only its rows are
+    used. Large maps are thinned to one detection per ~100 m cell and date,
+    which also caps the folium markers of a very large selected cluster.
+    The frame is built once per result set and selection and kept in
+    session state, so reruns neither rebuild it nor thin it again.
+    
+    Args:
+        selected_cluster (int): Selected cluster ID, or None
+        
+    Returns:
+        pandas.DataFrame: Detections to draw
+    """
+    cached = st.session_state.get('map_results')
+    if cached is not None and cached[0] == selected_cluster:
+        return cached[1]
+    
+    from app.ui.map import thin_points
+    
+    map_results = st.session_state.results
+    if selected_cluster is not None and selected_cluster >= 0:
+        cluster_results = get_cluster_results(selected_cluster)
+        if not cluster_results.empty:
+            map_results = cluster_results
+    
+    if len(map_results) > THIN_MAP_MIN_POINTS:
+        map_results = thin_points(map_results)
+    
+    st.session_state.map_results = (selected_cluster, map_results)
+    return map_results
+
+@st.fragment
+def render_playback_view(category, map_settings):
+    """
+    Render the playback map, timeline navigation and details for the selected cluster.
+    
+    Runs as a fragment so stepping through dates only reruns this view.
+    
+    Args:
+        category (str): Category of data
+        map_settings (dict): Color palette, basemap and dot size settings
+    """
+    from app.core.analysis import display_feature_exploration, display_coordinate_view
+    from app.ui.leaflet_component import playback_map
+    from app.ui.timeline import export_timeline, create_arrow_navigation
+    
+    # Get current date
+    playback_dates = st.session_state.get('playback_dates', [])
+    playback_index = st.session_state.get('playback_index', 0)
+    
+    if playback_dates and playback_index < len(playback_dates):
+        current_date = playback_dates[playback_index]
+        
+        # Get the playback points, built for every date on entering playback
+        playback_layers, bounds = get_playback_layers(category, map_settings)
+        
+        if playback_layers:
+            # The map stays mounted under its key, only the day's points are sent
+            playback_map(
+                playback_layers[playback_index],
+                f"{get_category_display_name(category)} {st.session_state.selected_cluster} - {format_date(current_date)}",
+                bounds,
+                view_key=str(st.session_state.selected_cluster),
+                key="playback_map"
+            )
+            
+            # Create timeline navigation
+            st.markdown("---")
+            st.subheader(f"{get_category_display_name(category)} {st.session_state.selected_cluster} Timeline")
+            
+            # Create arrow navigation
+            create_arrow_navigation()
+            
+            # Show feature exploration for the current date
+            if st.session_state.selected_cluster is not None:
+                # Use the updated function with the current date parameter
+                display_feature_exploration(
+                    st.session_state.results, 
+                    st.session_state.selected_cluster, 
+                    category, 
+                    current_date
+                )
+            
+            # Export option
+            if st.button("Export Timeline", key="export_timeline_btn", use_container_width=True):
+                export_timeline(
+                    st.session_state.results, 
+                    st.session_state.selected_cluster,
+                    category,
+                    playback_dates,
+                    BASEMAP_TILES,
+                    map_settings.get('basemap', DEFAULT_BASEMAP)
+                )
+            
+            # Exit playback button
+            if st.button("Exit Timeline View", key="exit_timeline_btn", use_container_width=True):
+                st.session_state.playback_mode = False
+                st.rerun()
+        
+        # Show coordinate data for the current date
+        if st.session_state.get('selected_cluster') is not None:
+            st.markdown("---")
+            display_coordinate_view(st.session_state.results, current_date)
+
 def main():
     """Main function to run the Streamlit app."""
     try:
@@ -73,13 +375,12 @@ def main():
             
         # Check for cluster ID in URL parameters
         cluster_id = None
-        if 'selected_cluster' in st.query_params:
+        raw_cluster_id = st.query_params.pop('selected_cluster', None)
+        if raw_cluster_id is not None:
             try:
-                cluster_id = int(st.query_params['selected_cluster'])
-                del st.query_params['selected_cluster']
+                cluster_id = int(raw_cluster_id)
             except (ValueError, TypeError):
-                if 'selected_cluster' in st.query_params:
-                    del st.query_params['selected_cluster']
+                pass
         
         # Create a two-column layout for the main interface
         main_cols = st.columns([1, 3])
@@ -92,7 +393,7 @@ def main():
             st.write("Please select your country")
             country = st.selectbox(
                 "Please select",
-                list(COUNTRY_BBOXES.keys())
+                COUNTRY_OPTIONS
             )
             
             # Add state selection when USA is selected
@@ -101,30 +402,25 @@ def main():
                 st.write("Please select a state or 'All States'")
                 selected_state = st.selectbox(
                     "Select state",
-                    list(US_STATE_BBOXES.keys())
+                    STATE_OPTIONS
                 )
             
             # Dataset selection - checkboxes
             st.subheader("Select Datasets")
             
-            datasets = {}
-            datasets['VIIRS_NOAA20_NRT'] = st.checkbox("VIIRS NOAA-20", value=True)
-            datasets['VIIRS_SNPP_NRT'] = st.checkbox("VIIRS SNPP", value=True)
-            datasets['MODIS_NRT'] = st.checkbox("MODIS", value=True)
-            
-            # Determine which datasets are selected
-            selected_datasets = [ds for ds, is_selected in datasets.items() if is_selected]
-            if selected_datasets:
-                dataset = selected_datasets[0]  # Use the first selected dataset
-            else:
+            # Use the first selected dataset
+            dataset = None
+            for ds, label, default in DATASET_OPTIONS:
+                if st.checkbox(label, value=default) and dataset is None:
+                    dataset = ds
+            if dataset is None:
                 st.warning('Please select at least one dataset')
-                dataset = None
             
             # Category selection
             st.subheader("Select Category")
             category = st.selectbox(
                 "Thermal Detection Type",
-                ["fires", "flares", "raw data"],
+                CATEGORY_OPTIONS,
                 key="category_select",
                 help="""
                 Fires: Temperature > 300K, FRP > 1.0 (VIIRS) or Confidence > 80% (MODIS)
@@ -141,8 +437,7 @@ def main():
                     st.session_state.selected_cluster = cluster_id
                     
                     # Get unique dates
-                    cluster_points = st.session_state.results[st.session_state.results['cluster'] == cluster_id]
-                    unique_dates = sorted(cluster_points['acq_date'].unique())
+                    unique_dates = get_cluster_playback_dates(cluster_id)
                     
                     # Store the dates
                     st.session_state.playback_dates = unique_dates
@@ -195,87 +490,84 @@ def main():
                 else:
                     st.warning(f"⚠️ You selected a {date_range_days}-day period for {country}, which is a large country. This may take a long time to process. Consider reducing your date range to 14 days or less for faster results.")
             
-            # API credentials (hidden in expander)
-            with st.expander("API Settings"):
-                username = st.text_input("FIRMS Username", value=DEFAULT_FIRMS_USERNAME)
-                password = st.text_input("FIRMS Password", value=DEFAULT_FIRMS_PASSWORD, type="password")
-                api_key = st.text_input("FIRMS API Key", value=DEFAULT_FIRMS_API_KEY)
+            # Settings below only take effect when the analysis is generated, so batch them in a form
+            with st.form("analysis_form", border=False):
+                # API credentials (hidden in expander)
+                with st.expander("API Settings"):
+                    username = st.text_input("FIRMS Username", value=DEFAULT_FIRMS_USERNAME)
+                    password = st.text_input("FIRMS Password", value=DEFAULT_FIRMS_PASSWORD, type="password")
+                    api_key = st.text_input("FIRMS API Key", value=DEFAULT_FIRMS_API_KEY)
             
-            # Clustering parameters (hidden in expander)
-            with st.expander("Advanced Clustering Settings"):
-                # Two-column layout for clustering parameters
+                # Clustering parameters (hidden in expander)
+                with st.expander("Advanced Clustering Settings"):
+                    # Two-column layout for clustering parameters
                 
-                clustering_disabled = category == 'raw data'
+                    clustering_disabled = category == 'raw data'
     
-                if clustering_disabled:
-                    st.info("Clustering options are disabled for raw data view")
+                    if clustering_disabled:
+                        st.info("Clustering options are disabled for raw data view")
         
-                clust_cols = st.columns(2)
+                    clust_cols = st.columns(2)
                 
-                with clust_cols[0]:
-                    eps = st.slider("Spatial Proximity (eps)", 0.005, 0.05, value=0.01, step=0.001, 
-                                   help="DBSCAN eps parameter. Higher values create larger clusters.")
+                    with clust_cols[0]:
+                        eps = st.slider("Spatial Proximity (eps)", 0.005, 0.05, value=0.01, step=0.001, 
+                                       help="DBSCAN eps parameter. Higher values create larger clusters.")
                 
-                with clust_cols[1]:
-                    min_samples = st.slider("Minimum Points", 3, 15, value=5, step=1,
-                                          help="Minimum points required to form a cluster.")
+                    with clust_cols[1]:
+                        min_samples = st.slider("Minimum Points", 3, 15, value=5, step=1,
+                                              help="Minimum points required to form a cluster.")
                     
-                use_clustering = st.checkbox("Use Clustering", value=True, 
-                                           help="Group nearby detections into clusters for easier analysis.")
+                    use_clustering = st.checkbox("Use Clustering", value=True, 
+                                               help="Group nearby detections into clusters for easier analysis.")
                                         
-                # Add time-based clustering parameter
-                max_time_diff = st.slider("Max Days Between Events (Same Cluster)", 1, 10, value=5, step=1,
-                                help="Maximum days between fire events to be considered same cluster.")
+                    # Add time-based clustering parameter
+                    max_time_diff = st.slider("Max Days Between Events (Same Cluster)", 1, 10, value=5, step=1,
+                                    help="Maximum days between fire events to be considered same cluster.")
         
-                show_multiday_only = st.checkbox("Show only multi-day fires", value=False,
-                                help="Filter to show only fires that span multiple days")
+                    show_multiday_only = st.checkbox("Show only multi-day fires", value=False,
+                                    help="Filter to show only fires that span multiple days")
+                
+                    st.checkbox("Show multi-day cluster details", value=False, key="debug_multiday",
+                                    help="List the days and date range of every cluster when filtering to multi-day fires")
                 
-                # Add the new toggle for strict country filtering (OFF by default)
-                use_strict_country_filtering = st.checkbox("Strict country filtering", value=False,
-                                help="Filter points to only those within exact country borders instead of rectangular bounding box")
+                    # Add the new toggle for strict country filtering (OFF by default)
+                    use_strict_country_filtering = st.checkbox("Strict country filtering", value=False,
+                                    help="Filter points to only those within exact country borders instead of rectangular bounding box")
             
-            # Generate button
-            generate_button = st.button("Generate Analysis", key="generate_button", use_container_width=True)
+                # Generate button
+                generate_button = st.form_submit_button("Generate Analysis", key="generate_button", use_container_width=True)
             
             # Add logic to check if we should proceed with analysis
             proceed_with_analysis = dataset is not None
             
             if generate_button and proceed_with_analysis:
                 with st.spinner("Analyzing fire data..."):
-                    handler = FIRMSHandler(username, password, api_key)
-                    
                     actual_use_clustering = use_clustering and category != 'raw data'
                     
                     # Determine if we need to pass state parameter
+                    state = None
                     if country == "United States" and selected_state and selected_state != "All States":
-                        results = handler.fetch_fire_data(
-                            country=country,
-                            state=selected_state,
-                            dataset=dataset,
-                            category=category,
-                            start_date=start_date,
-                            end_date=end_date,
-                            use_clustering=use_clustering,
-                            eps=eps,
-                            min_samples=min_samples,
-                            chunk_days=7,
-                            max_time_diff_days=max_time_diff,
-                            use_strict_country_filtering=use_strict_country_filtering
-                        )
-                    else:
-                        results = handler.fetch_fire_data(
-                            country=country,
-                            dataset=dataset,
-                            category=category,
-                            start_date=start_date,
-                            end_date=end_date,
-                            use_clustering=use_clustering,
-                            eps=eps,
-                            min_samples=min_samples,
-                            chunk_days=7,
-                            max_time_diff_days=max_time_diff,
-                            use_strict_country_filtering=use_strict_country_filtering
-                        )
+                        state = selected_state
+                    
+                    fetch_args = dict(
+                        country=country,
+                        state=state,
+                        dataset=dataset,
+                        category=category,
+                        start_date=start_date,
+                        end_date=end_date,
+                        use_clustering=use_clustering,
+                        eps=eps,
+                        min_samples=min_samples,
+                        chunk_days=7,
+                        max_time_diff_days=max_time_diff,
+                        use_strict_country_filtering=use_strict_country_filtering
+                    )
+                    results = fetch_fire_data_cached(username, password, api_key, **fetch_args)
+                    
+                    # Don't keep failed or partial fetches, so the next click retries FIRMS
+                    if results is None or results.attrs.get('failed_chunks'):
+                        fetch_fire_data_cached.clear(username, password, api_key, **fetch_args)
                     
                     # MULTI-DAY FILTERING CODE
                     if show_multiday_only and results is not None and not results.empty:
@@ -285,36 +577,55 @@ def main():
                         elif 'date' in results.columns and 'acq_date' not in results.columns:
                             results['acq_date'] = results['date']
                         
-                        # Debug information - before filtering
-                        all_clusters = results[results['cluster'] >= 0]['cluster'].unique()
-                        st.write(f"Found {len(all_clusters)} clusters before filtering")
-                        
-                        # Count days per cluster
-                        cluster_days = results[results['cluster'] >= 0].groupby('cluster')['acq_date'].nunique()
-                        
-                        # More detailed information
-                        for cluster_id, day_count in cluster_days.items():
-                            dates = sorted(results[results['cluster'] == cluster_id]['acq_date'].unique())
-                            date_range = f"{dates[0]} to {dates[-1]}" if len(dates) > 1 else dates[0]
-                            st.write(f"Cluster {cluster_id}: {day_count} days ({date_range})")
+                        # Count days per cluster in one pass
+                        cluster_groups = results.loc[results['cluster'] >= 0].groupby('cluster')['acq_date']
+                        cluster_days = cluster_groups.nunique()
                         
                         # Get multi-day clusters
-                        multiday_clusters = cluster_days[cluster_days > 1].index.tolist()
+                        multiday_clusters = cluster_days.index[cluster_days > 1].tolist()
+                        st.caption(f"{len(cluster_days)} clusters → {len(multiday_clusters)} multi-day")
+                        
+                        # Date ranges are only worked out for the troubleshooting breakdown
+                        if st.session_state.get('debug_multiday', False):
+                            st.dataframe(
+                                cluster_groups.agg(days='nunique', first_date='min', last_date='max'),
+                                use_container_width=True
+                            )
                         
                         # Filter results to keep only multi-day clusters
                         if multiday_clusters:
-                            multi_day_mask = results['cluster'].isin(multiday_clusters)
-                            filtered_results = results[multi_day_mask].copy()
+                            # Look labels up in a dense table (slot 0 is noise) instead of hashing them
+                            labels = results['cluster'].to_numpy()
+                            is_multiday = np.zeros(labels.max() + 2, dtype=bool)
+                            is_multiday[np.asarray(multiday_clusters) + 1] = True
+                            multi_day_mask = is_multiday[labels + 1]
+                            # take already returns a new frame that is safe to modify, no extra copy needed
+                            results = results.take(np.flatnonzero(multi_day_mask))
                             st.success(f"✓ Filtered to {len(multiday_clusters)} clusters that span multiple days")
-                            results = filtered_results
                         else:
                             st.warning("⚠ No multi-day fire clusters found. Try adjusting clustering parameters or date range.")
 
                         if not multiday_clusters:
                             st.warning("⚠ No multi-day fire clusters found. The clustering algorithm didn't find any fires spanning multiple days. Try increasing the 'Max Days Between Events' slider or adjust the 'Spatial Proximity' value.")
                     
+                    # Store cluster labels in the narrowest integer type that fits
+                    if results is not None and 'cluster' in results.columns:
+                        results['cluster'] = pd.to_numeric(results['cluster'], downcast='integer')
+                        # Keep each cluster's rows together and in date order
+                        if 'acq_date' in results.columns:
+                            results = results.sort_values(['cluster', 'acq_date'], kind='mergesort', ignore_index=True)
+                    
                     # Store results in session state
                     st.session_state.results = results
+                    st.session_state.playback_layers = None
+                    st.session_state.map_results = None
+                    st.session_state.cluster_summary = None
+                    # Precompute the dates and row positions of each cluster for playback
+                    st.session_state.cluster_dates = get_cluster_dates(results)
+                    st.session_state.cluster_rows = (
+                        results.groupby('cluster', sort=False).indices
+                        if results is not None and 'cluster' in results.columns else None
+                    )
                     # Reset selected cluster
                     st.session_state.selected_cluster = None
                     # Reset playback mode
@@ -327,8 +638,14 @@ def main():
             # First handle URL parameters
             handle_url_parameters(category)
             
+            # Read the session values once for the rest of this column
+            results = st.session_state.get('results')
+            has_results = results is not None and not results.empty
+            selected_cluster = st.session_state.get('selected_cluster')
+            playback_mode = st.session_state.get('playback_mode', False)
+            
             # Then check for results
-            if 'results' in st.session_state and st.session_state.results is not None and not st.session_state.results.empty:
+            if has_results:
                 st.subheader(f"Detection Map")
                 
                 # Set up variables for map creation
@@ -339,24 +656,46 @@ def main():
                 })
                 
                 # Check if we're in playback mode
-                if not st.session_state.get('playback_mode', False):
-                    # NORMAL MODE - Create the folium visualization
-                    with st.spinner("Generating map..."):
-                        folium_map = plot_fire_detections_folium(
-                            st.session_state.results, 
-                            f"{category_display} Clusters - {country}", 
-                            st.session_state.get('selected_cluster'),
-                            category=category,
-                            color_palette=map_settings.get('color_palette', DEFAULT_COLOR_PALETTE),
-                            dot_size_multiplier=map_settings.get('dot_size_multiplier', DEFAULT_DOT_SIZE_MULTIPLIER)
-                        )
+                if not playback_mode:
+                    # NORMAL MODE - Create the map visualization
+                    map_results = get_map_results(selected_cluster)
+                    
+                    # Large overview maps are drawn with WebGL, folium markers do not scale to them
+                    html_map = None
+                    deck = None
+                    if selected_cluster is None and len(map_results) >= WEBGL_MAP_MIN_POINTS:
+                        with st.spinner("Generating map..."):
+                            deck = render_fire_map_deck(
+                                map_results,
+                                category=category,
+                                color_palette=map_settings.get('color_palette', DEFAULT_COLOR_PALETTE),
+                                dot_size_multiplier=map_settings.get('dot_size_multiplier', DEFAULT_DOT_SIZE_MULTIPLIER)
+                            )
+                        if deck is not None:
+                            st.markdown(f"**{category_display} Clusters - {country}**")
+                            st.pydeck_chart(
+                                deck,
+                                height=550,
+                                selection_mode="single-object",
+                                on_select=partial(select_cluster_from_deck, category),
+                                key="detection_deck"
+                            )
+                    else:
+                        with st.spinner("Generating map..."):
+                            html_map = render_fire_map_html(
+                                map_results, 
+                                f"{category_display} Clusters - {country}", 
+                                selected_cluster,
+                                category=category,
+                                color_palette=map_settings.get('color_palette', DEFAULT_COLOR_PALETTE),
+                                dot_size_multiplier=map_settings.get('dot_size_multiplier', DEFAULT_DOT_SIZE_MULTIPLIER)
+                            )
                     
-                    if folium_map:
+                    if html_map:
                         # Display the folium map
-                        html_map = folium_map._repr_html_()
                         components.html(html_map, height=550, width=985)
                         
-                        if st.session_state.get('selected_cluster') is not None:
+                        if selected_cluster is not None:
                             if st.button("← Exit Cluster Selection", 
                                         type="primary", 
                                         key="exit_cluster_btn",
@@ -369,11 +708,12 @@ def main():
                                 st.rerun()
                         
                         # If a cluster is selected, show timeline options
-                        if st.session_state.get('selected_cluster') is not None:
+                        if selected_cluster is not None:
                             # Check if this cluster has data for multiple dates
-                            if has_multiple_dates(st.session_state.results, st.session_state.selected_cluster):
+                            unique_dates = get_cluster_playback_dates(selected_cluster)
+                            if len(unique_dates) > 1:
                                 st.markdown("---")
-                                st.subheader(f"{get_category_display_name(category)} {st.session_state.selected_cluster} Timeline")
+                                st.subheader(f"{get_category_display_name(category)} {selected_cluster} Timeline")
                                 
                                 # Container for timeline buttons
                                 timeline_cols = st.columns([1, 1])
@@ -383,9 +723,6 @@ def main():
                                         # Enable playback mode
                                         st.session_state.playback_mode = True
                                         
-                                        # Get unique dates for the selected cluster
-                                        cluster_points = st.session_state.results[st.session_state.results['cluster'] == st.session_state.selected_cluster]
-                                        unique_dates = sorted(cluster_points['acq_date'].unique())
                                         st.session_state.playback_dates = unique_dates
                                         st.session_state.playback_index = 0
                                         
@@ -393,13 +730,10 @@ def main():
                                 
                                 with timeline_cols[1]:
                                     if st.button("Export Timeline", key="export_timeline_btn", use_container_width=True):
-                                        # Get unique dates for the selected cluster
-                                        cluster_points = st.session_state.results[st.session_state.results['cluster'] == st.session_state.selected_cluster]
-                                        unique_dates = sorted(cluster_points['acq_date'].unique())
-                                        
+                                        from app.ui.timeline import export_timeline
                                         export_timeline(
-                                            st.session_state.results, 
-                                            st.session_state.selected_cluster,
+                                            results, 
+                                            selected_cluster,
                                             category,
                                             unique_dates,
                                             BASEMAP_TILES,
@@ -407,114 +741,28 @@ def main():
                                         )
                             else:
                                 st.info(f"This {get_category_singular(category)} only appears on one date. Timeline features require data on multiple dates.")
-                    else:
+                    elif deck is None:
                         st.warning("No data to display on the map.")
                 else:
-                    # PLAYBACK MODE - We're in playback mode - get current date
-                    playback_dates = st.session_state.get('playback_dates', [])
-                    playback_index = st.session_state.get('playback_index', 0)
-                    
-                    if playback_dates and playback_index < len(playback_dates):
-                        current_date = playback_dates[playback_index]
-                        
-                        # Create the playback visualization
-                        playback_title = f"{category_display} {st.session_state.get('selected_cluster')} - {current_date}"
-                        
-                        # PRE-FILTER the data to only include the selected cluster
-                        cluster_filtered_results = st.session_state.results[
-                            st.session_state.results['cluster'] == st.session_state.get('selected_cluster')
-                        ].copy()
-                        
-                        folium_map = plot_fire_detections_folium(
-                            cluster_filtered_results,  # ONLY pass the pre-filtered data
-                            playback_title,
-                            st.session_state.get('selected_cluster'),
-                            True,
-                            current_date,
-                            category=category,
-                            color_palette=map_settings.get('color_palette', DEFAULT_COLOR_PALETTE),
-                            dot_size_multiplier=map_settings.get('dot_size_multiplier', DEFAULT_DOT_SIZE_MULTIPLIER)
-                        )
-                        
-                        if folium_map:
-                            # Save the map to an HTML string and display it using components
-                            html_map = folium_map._repr_html_()
-                            components.html(html_map, height=550, width=985)
-                            
-                            # Create timeline navigation
-                            st.markdown("---")
-                            st.subheader(f"{get_category_display_name(category)} {st.session_state.selected_cluster} Timeline")
-                            
-                            # Create arrow navigation
-                            create_arrow_navigation()
-                            
-                            # Show feature exploration for the current date
-                            if st.session_state.selected_cluster is not None:
-                                # Use the updated function with the current date parameter
-                                display_feature_exploration(
-                                    st.session_state.results, 
-                                    st.session_state.selected_cluster, 
-                                    category, 
-                                    current_date
-                                )
-                            
-                            # Export option
-                            if st.button("Export Timeline", key="export_timeline_btn", use_container_width=True):
-                                export_timeline(
-                                    st.session_state.results, 
-                                    st.session_state.selected_cluster,
-                                    category,
-                                    playback_dates,
-                                    BASEMAP_TILES,
-                                    map_settings.get('basemap', DEFAULT_BASEMAP)
-                                )
-                            
-                            # Exit playback button
-                            if st.button("Exit Timeline View", key="exit_timeline_btn", use_container_width=True):
-                                st.session_state.playback_mode = False
-                                st.rerun()
+                    # PLAYBACK MODE - only this view reruns while stepping through dates
+                    render_playback_view(category, map_settings)
                 
                 # If a cluster is selected, show feature graphs under the map (not in playback mode)
-                if st.session_state.get('selected_cluster') is not None and not st.session_state.get('playback_mode', False):
+                if selected_cluster is not None and not playback_mode:
                     # Display feature exploration directly under map
-                    display_feature_exploration(st.session_state.results, st.session_state.get('selected_cluster'), category)
+                    from app.core.analysis import display_feature_exploration
+                    display_feature_exploration(results, selected_cluster, category)
                 
-                # Show coordinate data at the bottom for selected cluster
-                if st.session_state.get('selected_cluster') is not None:
+                # Show coordinate data at the bottom for selected cluster (playback shows its own)
+                if selected_cluster is not None and not playback_mode:
                     st.markdown("---")
-                    if st.session_state.get('playback_mode', False):
-                        playback_dates = st.session_state.get('playback_dates', [])
-                        playback_index = st.session_state.get('playback_index', 0)
-                        if playback_dates and playback_index < len(playback_dates):
-                            display_coordinate_view(st.session_state.results, playback_dates[playback_index])
-                    else:
-                        display_coordinate_view(st.session_state.results)
-            
-            # Create a collapsible sidebar for cluster summary table
-            # Use HTML/JS for the custom sidebar
-            cluster_summary = None
-            if 'results' in st.session_state and st.session_state.results is not None and not st.session_state.results.empty:
-                cluster_summary = create_cluster_summary(st.session_state.results, category)
+                    from app.core.analysis import display_coordinate_view
+                    display_coordinate_view(results)
             
-            # Add the sidebar HTML
-            st.components.v1.html(create_custom_sidebar_js(), height=0)
-            
-            # Create a container for the sidebar content
-            sidebar_container = st.container()
-            
-            # Sidebar content in a hidden div that will be moved to the sidebar by JS
-            with st.container():
-                # Hide this container visually but keep it in the DOM
-                st.markdown('<div id="hidden-sidebar-content" style="display:none">', unsafe_allow_html=True)
-                
-                if cluster_summary is not None:
-                    render_sidebar_content(cluster_summary, category)
-                
-                # Close the hidden content div
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-            # Add the script to move content
-            st.components.v1.html(move_content_to_sidebar_js(), height=0)
+            # Show the cluster summary table in the Streamlit sidebar
+            if has_results:
+                with st.sidebar:
+                    render_sidebar_content(get_cluster_summary(category), category)
             
             # Add script for exit cluster button
             exit_cluster_js = """
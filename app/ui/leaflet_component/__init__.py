@@ -0,0 +1,37 @@
+"""
+Persistent Leaflet map component for timeline playback.
+Keeps one map (tiles, view and controls) alive while the displayed points change.
+"""
+import os
+
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_playback_map = components.declare_component("playback_map", path=_FRONTEND_DIR)
+
+def playback_map(layer, title, bounds, view_key, height=550, key=None):
+    """
+    Display the playback map, updating the existing map in place on reruns.
+    
+    The component is mounted once per key. Later calls only send the new
+    points, so stepping through dates does not reload Leaflet or the tiles.
+    
+    Args:
+        layer (dict): Points and legend from playback_layer_data
+        title (str): Title shown over the map
+        bounds (list): [[min_lat, min_lon], [max_lat, max_lon]] to fit the view to
+        view_key (str): The view is only refitted to bounds when this changes
+        height (int): Height of the map in pixels
+        key (str, optional): Streamlit widget key keeping the map mounted
+    """
+    _playback_map(
+        features=layer['features'],
+        legend=layer['legend'],
+        radius=layer['radius'],
+        title=title,
+        bounds=bounds,
+        view_key=view_key,
+        height=height,
+        key=key,
+        default=None
+    )
@@ -6,14 +6,168 @@ from app.config.settings import BASEMAP_TILES, COLOR_PALETTES, USE_GEOJSON_BORDE
 
 import folium
 from folium.plugins import Fullscreen, Draw
+from folium.utilities import JsCode
 from branca.colormap import LinearColormap
 import streamlit.components.v1 as components
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pydeck as pdk
+from pandas.api.types import is_datetime64_any_dtype
 import base64
+from functools import lru_cache
+import hashlib
+import threading
 from io import BytesIO
 
-from app.core.utils import get_temp_column, get_category_display_name
+from app.core.utils import get_temp_column, get_category_display_name, format_date
+
+_CARTO_ATTRIBUTION = '© <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors, © <a href="https://carto.com/attribution">CARTO</a>'
+
+# Switchable base layers of the detection map as (tiles, name, attribution)
+_BASE_LAYERS = (
+    ('cartodbpositron', 'Light Map', _CARTO_ATTRIBUTION),
+    ('cartodbdark_matter', 'Dark Map', _CARTO_ATTRIBUTION),
+    ('stamenterrain', 'Terrain Map',
+     'Map tiles by <a href="http://stamen.com">Stamen Design</a>, under <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a>. Data by <a href="http://openstreetmap.org">OpenStreetMap</a>, under <a href="http://www.openstreetmap.org/copyright">ODbL</a>.'),
+    ('https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}', 'Satellite',
+     'Tiles &copy; Esri &mdash; Source: Esri, i-cubed, USDA, USGS, AEX, GeoEye, Getmapping, Aerogrid, IGN, IGP, UPR-EGP, and the GIS User Community'),
+)
+
+# Closest zoom the initial view is fitted to, so a small cluster does not
+# open at street level and fetch tiles nobody asked for
+_FIT_MAX_ZOOM = 13
+
+# Point values of the export map being rendered on this thread, passed to
+# _export_html beside its cache key
+_export_pending = threading.local()
+
+# Styles each marker of a GeoJson point layer and formats its popup and
+# tooltip in the browser from the compact feature properties of
+# _detection_features; %s is the JS expression of the popup HTML
+_MARKER_ON_EACH_FEATURE = """
+function (feature, layer) {
+    var p = feature.properties;
+    var coords = feature.geometry.coordinates[1].toFixed(4) + ', ' + feature.geometry.coordinates[0].toFixed(4);
+    layer.setStyle({fillColor: p.k});
+    layer.bindPopup(%s, {maxWidth: 300});
+    layer.bindTooltip('Cluster ' + p.c + (p.s ? ' - Selected' : '') + ' - (' + coords + ')', {sticky: true});
+}
+"""
+
+# Popup with the details of a detection
+_DETAIL_POPUP_JS = JsCode(_MARKER_ON_EACH_FEATURE % """(
+        '<b>Cluster:</b> ' + p.c + '<br>' +
+        '<b>Date:</b> ' + p.d + '<br>' +
+        '<b>Time:</b> ' + p.t + '<br>' +
+        '<b>FRP:</b> ' + p.f.toFixed(2) + '<br>' +
+        '<b>Coordinates:</b> ' + coords + '<br>' +
+        (p.T === null ? '' : '<b>Temperature:</b> ' + p.T.toFixed(2) + 'K<br>')
+    )""")
+
+# Popup of the all-clusters view, pointing the user to the cluster selection
+_SELECT_POPUP_JS = JsCode(_MARKER_ON_EACH_FEATURE % """(
+        '<div style="text-align: center;">' +
+        '<p><b>Cluster:</b> ' + p.c + '</p>' +
+        '<p><b>Date:</b> ' + p.d + '</p>' +
+        '<p><b>Time:</b> ' + p.t + '</p>' +
+        '<p><b>FRP:</b> ' + p.f.toFixed(2) + '</p>' +
+        '<p><b>Coordinates:</b> ' + coords + '</p>' +
+        '<button onclick="selectCluster(' + p.c + ')" ' +
+        'style="background-color: #4CAF50; color: white; padding: 10px 20px; ' +
+        'border: none; border-radius: 5px; cursor: pointer;">' +
+        'Please select ' + p.c + ' from the drop-down menu below' +
+        '</button></div>'
+    )""")
+
+def _lat_lon_bounds(df):
+    """
+    Get the bounding box of the detections in one pass over both coordinates.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with latitude and longitude columns
+        
+    Returns:
+        tuple: (min_lat, min_lon, max_lat, max_lon)
+    """
+    lat_lon = df[['latitude', 'longitude']].to_numpy(dtype=float)
+    (min_lat, min_lon), (max_lat, max_lon) = np.nanmin(lat_lon, axis=0), np.nanmax(lat_lon, axis=0)
+    return float(min_lat), float(min_lon), float(max_lat), float(max_lon)
+
+def _lon_lat_pairs(df):
+    """
+    Get the [longitude, latitude] pair of every row, in GeoJSON order.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with latitude and longitude columns
+        
+    Returns:
+        list: [longitude, latitude] list for each row
+    """
+    return np.column_stack((df['longitude'].to_numpy(), df['latitude'].to_numpy())).tolist()
+
+def _circle_marker_layer(features, radius, weight, on_each_feature=_DETAIL_POPUP_JS):
+    """
+    Draw point features as circle markers in a single GeoJson layer.
+    
+    Leaflet builds the markers from one embedded FeatureCollection, instead
+    of folium rendering a CircleMarker and Popup element for every point.
+    
+    Args:
+        features (list): Features from _detection_features
+        radius (float): Marker radius in pixels
+        weight (float): White border width
+        on_each_feature (JsCode): Binds the popup and tooltip of each marker
+        
+    Returns:
+        folium.GeoJson: Layer to add to the map
+    """
+    return folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        marker=folium.CircleMarker(radius=radius, color='white', weight=weight, fill=True, fill_opacity=0.9),
+        on_each_feature=on_each_feature
+    )
+
+def _detection_features(df, colors, default_color, temp_col, selected=False):
+    """
+    Build the GeoJSON point features of a marker group.
+    
+    Only the raw fields go into the properties, under short keys, and the
+    popup and tooltip HTML is formatted in the browser. This keeps the page
+    much smaller than embedding the HTML of every popup.
+    
+    Args:
+        df (pandas.DataFrame): Detections in the group
+        colors (numpy.ndarray): Fill color per detection, None where missing
+        default_color (str): Fill color used where the color is missing
+        temp_col (str): Temperature column, or None
+        selected (bool): Whether the detections belong to the selected cluster
+        
+    Returns:
+        list: Features for _circle_marker_layer
+    """
+    temps = [None] * len(df)
+    if temp_col:
+        temps = df[temp_col].round(2).astype(object).where(df[temp_col].notna(), None).tolist()
+    
+    columns = zip(
+        _lon_lat_pairs(df),
+        colors.tolist(),
+        df['cluster'].astype(str).tolist(),
+        df['acq_date'].astype(str).tolist(),
+        df['acq_time'].astype(str).tolist(),
+        df['frp'].round(2).tolist(),
+        temps
+    )
+    return [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': coordinates},
+            'properties': {'k': color or default_color, 'c': cluster, 'd': date, 't': time,
+                           'f': frp, 'T': temp, 's': selected}
+        }
+        for coordinates, color, cluster, date, time, frp, temp in columns
+    ]
 
 def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=None, 
                               playback_mode=False, playback_date=None, 
@@ -36,39 +190,42 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
         folium.Map: Folium map object
     """
                 
-    from app.config.settings import BASEMAP_TILES, COLOR_PALETTES
-    
-    # Create a working copy of the dataframe
-    plot_df = df.copy()
-    
 #    st.write(f"DEBUG: Input dataframe has {len(df)} rows")
 #    st.write(f"DEBUG: Selected cluster: {selected_cluster}, Playback mode: {playback_mode}, Date: {playback_date}")
     
+    # Combine the noise, cluster and playback filters into one mask so the
+    # frame is sliced once (and not at all when every row is kept)
+    clusters = df['cluster'].to_numpy()
+    mask = np.ones(len(df), dtype=bool)
+    
     # Filter out noise points (-1) if category is not raw data
     if category != "raw data":
-        plot_df = plot_df[plot_df['cluster'] >= 0].copy()
+        mask &= clusters >= 0
     
     # Apply cluster selection filter if a cluster is selected
-    if selected_cluster is not None and selected_cluster in plot_df['cluster'].values:
-        # Filter for just the selected cluster
-        plot_df = plot_df[plot_df['cluster'] == selected_cluster].copy()
-        # Get category display name for title
-        category_display = get_category_display_name(category)
-        title = f"{title} - {category_display} {selected_cluster}"
+    cluster_selected = False
+    if selected_cluster is not None:
+        is_selected = mask & (clusters == selected_cluster)
+        cluster_selected = is_selected.any()
+        if cluster_selected:
+            # Filter for just the selected cluster
+            mask = is_selected
+            # Get category display name for title
+            category_display = get_category_display_name(category)
+            title = f"{title} - {category_display} {selected_cluster}"
     
     # Then apply playback filter if in playback mode
     if playback_mode and playback_date is not None:
-        plot_df = plot_df[plot_df['acq_date'] == playback_date].copy()
-        title = f"{title} - {playback_date}"
-        
-    if playback_mode and playback_date is not None:
-        # Convert the date comparison to strings to ensure consistent formatting
-        df_dates = plot_df['acq_date'].astype(str)
-        playback_date_str = str(playback_date)
+        # Compare as datetimes so string and Timestamp dates still match
+        df_dates = df['acq_date']
+        if not is_datetime64_any_dtype(df_dates):
+            df_dates = pd.to_datetime(df_dates, format='%Y-%m-%d', cache=True)
         
-        plot_df = plot_df[df_dates == playback_date_str].copy()
-        st.write(f"DEBUG: After date filtering, found {len(plot_df)} rows for date {playback_date}")
-        title = f"{title} - {playback_date}"
+        mask &= (df_dates == pd.Timestamp(playback_date)).to_numpy()
+        title = f"{title} - {format_date(playback_date)}"
+    
+    plot_df = df if mask.all() else df[mask]
+#    st.write(f"DEBUG: After filtering, found {len(plot_df)} rows")
     
     # Check if there is any data to plot
     if plot_df.empty:
@@ -100,10 +257,7 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
         return m     
     
     # Calculate the bounding box for auto-zoom
-    min_lat = plot_df['latitude'].min()
-    max_lat = plot_df['latitude'].max()
-    min_lon = plot_df['longitude'].min()
-    max_lon = plot_df['longitude'].max()
+    min_lat, min_lon, max_lat, max_lon = _lat_lon_bounds(plot_df)
     
     # Create a map centered on the mean coordinates with appropriate zoom
     center_lat = (min_lat + max_lat) / 2
@@ -116,9 +270,16 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
     initial_tiles = 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}'
     tile_attr = 'Default Satellite Basemap'  # Simplified display name
     
-    # Create the map with simplified attribution
+    # Create the map with simplified attribution. Markers are drawn on one
+    # canvas rather than as an SVG element each, which keeps panning smooth
+    # with thousands of points
     m = folium.Map(location=[center_lat, center_lon], control_scale=True, 
-                  tiles=initial_tiles, attr=tile_attr)
+                  tiles=None, prefer_canvas=True)
+    
+    # Fit to the points before any tiles are attached, so the browser only
+    # lays out and fetches tiles for the final view
+    m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]], padding=(50, 50), max_zoom=_FIT_MAX_ZOOM)
+    folium.TileLayer(initial_tiles, attr=tile_attr).add_to(m)
     
     if USE_GEOJSON_BORDERS and title:
         # Extract country name from title
@@ -157,9 +318,6 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
     
     Fullscreen().add_to(m)
     
-    # Automatically zoom to fit all points
-    m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]], padding=(50, 50))
-    
     # Fix whitespace issue by modifying the title HTML
     title_html = f'''
     <style>
@@ -201,148 +359,48 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
             caption=f'Temperature (K)'
         )
     
+    # Marker colors for every point at once, None where the temperature is missing
+    point_colors = np.full(len(plot_df), None, dtype=object)
+    if temp_col:
+        temps = plot_df[temp_col].to_numpy(dtype=float)
+        valid = ~np.isnan(temps)
+        point_colors[valid] = _palette_hex(temps[valid], selected_palette, vmin, vmax)
+    
     # Base dot sizes, will be multiplied by the dot_size_multiplier
-    base_small_dot = 5 * dot_size_multiplier
     base_medium_dot = 6 * dot_size_multiplier
     base_large_dot = 8 * dot_size_multiplier
     
-    # Process data based on selection state
-    if selected_cluster is not None and selected_cluster in plot_df['cluster'].values:
-        # Split data into selected and unselected
-        selected_data = plot_df[plot_df['cluster'] == selected_cluster]
-        other_data = plot_df[plot_df['cluster'] != selected_cluster]
-        
-        # Add unselected clusters if not in playback mode
-        if not other_data.empty and not playback_mode:
-            for idx, point in other_data.iterrows():
-                if temp_col and not pd.isna(point[temp_col]):
-                    color = colormap(point[temp_col])
-                else:
-                    color = '#3186cc'  # Default blue
-                
-                popup_text = f"""
-                <b>Cluster:</b> {point['cluster']}<br>
-                <b>Date:</b> {point['acq_date']}<br>
-                <b>Time:</b> {point['acq_time']}<br>
-                <b>FRP:</b> {point['frp']:.2f}<br>
-                <b>Coordinates:</b> {point['latitude']:.4f}, {point['longitude']:.4f}<br>
-                """
-                if temp_col and not pd.isna(point[temp_col]):
-                    popup_text += f"<b>Temperature:</b> {point[temp_col]:.2f}K<br>"
-                
-                circle = folium.CircleMarker(
-                    location=[point['latitude'], point['longitude']],
-                    radius=base_small_dot,
-                    color='white',  # Use white border for visibility on dark background
-                    weight=0.5,
-                    fill=True,
-                    fill_color=color,
-                    fill_opacity=0.9,  # Increased opacity for better visibility
-                    popup=folium.Popup(popup_text, max_width=300),
-                    tooltip=f"Cluster {point['cluster']} - ({point['latitude']:.4f}, {point['longitude']:.4f})"
-                )
-                
-                circle.add_to(fg_all)
+    # Process data based on selection state. plot_df only keeps the selected
+    # cluster once one is chosen, so every point goes into a single layer
+    if cluster_selected:
+        selected_features = _detection_features(
+            plot_df,
+            point_colors,
+            '#ff3300',  # Default red
+            temp_col,
+            selected=True
+        )
         
-        # Add selected cluster with different style
-        if not selected_data.empty:
-            for idx, point in selected_data.iterrows():
-                if temp_col and not pd.isna(point[temp_col]):
-                    color = colormap(point[temp_col])
-                else:
-                    color = '#ff3300'  # Default red
-                
-                popup_text = f"""
-                <b>Cluster:</b> {point['cluster']}<br>
-                <b>Date:</b> {point['acq_date']}<br>
-                <b>Time:</b> {point['acq_time']}<br>
-                <b>FRP:</b> {point['frp']:.2f}<br>
-                <b>Coordinates:</b> {point['latitude']:.4f}, {point['longitude']:.4f}<br>
-                """
-                if temp_col and not pd.isna(point[temp_col]):
-                    popup_text += f"<b>Temperature:</b> {point[temp_col]:.2f}K<br>"
-                
-                folium.CircleMarker(
-                    location=[point['latitude'], point['longitude']],
-                    radius=base_large_dot,
-                    color='white',  # White border for visibility
-                    weight=1.5,
-                    fill=True,
-                    fill_color=color,
-                    fill_opacity=0.9,
-                    popup=folium.Popup(popup_text, max_width=300),
-                    tooltip=f"Cluster {point['cluster']} - Selected - ({point['latitude']:.4f}, {point['longitude']:.4f})"
-                ).add_to(fg_selected)
+        _circle_marker_layer(selected_features, radius=base_large_dot, weight=1.5).add_to(fg_selected)
     else:
-        # Add all points with default style
-        for idx, point in plot_df.iterrows():
-            if temp_col and not pd.isna(point[temp_col]):
-                color = colormap(point[temp_col])
-            else:
-                color = '#3186cc'  # Default blue
-
-            # Create a popup with a URL parameter-based cluster selection
-            popup_html = f"""
-            <div style="text-align: center;">
-                <p><b>Cluster:</b> {point['cluster']}</p>
-                <p><b>Date:</b> {point['acq_date']}</p>
-                <p><b>Time:</b> {point['acq_time']}</p>
-                <p><b>FRP:</b> {point['frp']:.2f}</p>
-                <p><b>Coordinates:</b> {point['latitude']:.4f}, {point['longitude']:.4f}</p>
-                <button onclick="selectCluster({point['cluster']})" 
-                style="background-color: #4CAF50; 
-                        color: white; 
-                        padding: 10px 20px; 
-                        border: none; 
-                        border-radius: 5px; 
-                        cursor: pointer;">
-                    Please select {point['cluster']} from the drop-down menu below
-                </button>
-            </div>
-            """
-            popup = folium.Popup(popup_html, max_width=300)
-
-            folium.CircleMarker(
-                location=[point['latitude'], point['longitude']],
-                radius=base_medium_dot,
-                color='white',  # White border for visibility
-                weight=0.5,
-                fill=True,
-                fill_color=color,
-                fill_opacity=0.9,  # Increased opacity
-                popup=popup,
-                tooltip=f"Cluster {point['cluster']} - ({point['latitude']:.4f}, {point['longitude']:.4f})"
-            ).add_to(fg_all)
+        # Add all points with default style, with a popup for URL parameter-based cluster selection
+        all_features = _detection_features(
+            plot_df,
+            point_colors,
+            '#3186cc',  # Default blue
+            temp_col
+        )
+        
+        # Use white border for visibility on dark background
+        _circle_marker_layer(all_features, radius=base_medium_dot, weight=0.5,
+                             on_each_feature=_SELECT_POPUP_JS).add_to(fg_all)
 
     fg_all.add_to(m)
     fg_selected.add_to(m)
 
     # Add base layers with explicit names - using satellite as default
-    folium.TileLayer(
-        'cartodbpositron', 
-        name='Light Map',
-        attr='© <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors, © <a href="https://carto.com/attribution">CARTO</a>'
-    ).add_to(m)
-
-    folium.TileLayer(
-        'cartodbdark_matter', 
-        name='Dark Map',
-        attr='© <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors, © <a href="https://carto.com/attribution">CARTO</a>'
-    ).add_to(m)
-
-    folium.TileLayer(
-        'stamenterrain', 
-        name='Terrain Map',
-        attr='Map tiles by <a href="http://stamen.com">Stamen Design</a>, under <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a>. Data by <a href="http://openstreetmap.org">OpenStreetMap</a>, under <a href="http://www.openstreetmap.org/copyright">ODbL</a>.'
-    ).add_to(m)
-
-    folium.TileLayer(
-        'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}',
-        name='Satellite',
-        attr='Tiles &copy; Esri &mdash; Source: Esri, i-cubed, USDA, USGS, AEX, GeoEye, Getmapping, Aerogrid, IGN, IGP, UPR-EGP, and the GIS User Community',
-        overlay=False,
-        control=True
-    ).add_to(m)
+    for tiles, name, attr in _BASE_LAYERS:
+        folium.TileLayer(tiles, name=name, attr=attr).add_to(m)
 
     # Add only ONE layer control
     layer_control = folium.LayerControl(position='topright')
@@ -426,6 +484,223 @@ def plot_fire_detections_folium(df, title="Fire Detections", selected_cluster=No
     return m
 
 
+def thin_points(df, precision=3):
+    """
+    Keep one detection per coarse grid cell, cluster and date for overview maps.
+    
+    Coordinates are snapped to the given number of decimals (3 is ~110 m),
+    which is below what an overview map can show, so nothing visible is lost.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with fire data
+        precision (int): Decimals kept when snapping coordinates
+        
+    Returns:
+        pandas.DataFrame: First detection of every cell, cluster and date
+    """
+    scale = 10 ** precision
+    cells = pd.DataFrame({
+        'lat': np.round(df['latitude'].to_numpy() * scale).astype(np.int64),
+        'lon': np.round(df['longitude'].to_numpy() * scale).astype(np.int64),
+        'cluster': df['cluster'].to_numpy(),
+        'date': df['acq_date'].to_numpy(),
+    })
+    return df.take(np.flatnonzero(~cells.duplicated().to_numpy()))
+
+@lru_cache(maxsize=32)
+def _palette_stops(palette):
+    """
+    Parse a hex color palette into RGB components, once per palette.
+    
+    Args:
+        palette (tuple): Hex color strings
+        
+    Returns:
+        numpy.ndarray: Read-only (n, 3) float array of 0-255 components
+    """
+    stops = np.array([[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in palette], dtype=float)
+    stops.setflags(write=False)
+    return stops
+
+def _palette_rgb(values, palette):
+    """
+    Interpolate values onto a hex color palette.
+    
+    Args:
+        values (numpy.ndarray): Values to color, spread over the palette from min to max
+        palette (list): Hex color strings
+        
+    Returns:
+        numpy.ndarray: (n, 3) array of RGB components
+    """
+    stops = _palette_stops(tuple(palette))
+    vmin, vmax = values.min(), values.max()
+    position = (values - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(values)
+    stop_positions = np.linspace(0, 1, len(palette))
+    return np.column_stack([
+        np.interp(position, stop_positions, stops[:, channel]) for channel in range(3)
+    ]).round().astype(np.uint8)
+
+def _palette_hex(values, palette, vmin, vmax):
+    """
+    Map values onto a hex color palette, matching branca's LinearColormap.
+    
+    Gives the same '#rrggbbaa' strings as calling the colormap on every
+    value, computed for the whole array at once.
+    
+    Args:
+        values (numpy.ndarray): Values to color
+        palette (list): Hex color strings spread evenly from vmin to vmax
+        vmin (float): Value mapped to the first color
+        vmax (float): Value mapped to the last color
+        
+    Returns:
+        numpy.ndarray: Hex color string for each value
+    """
+    stops = _palette_stops(tuple(palette)) / 255
+    if vmax > vmin:
+        index = np.linspace(vmin, vmax, len(palette))
+        rgb = np.column_stack([
+            np.interp(values, index, stops[:, channel]) for channel in range(3)
+        ])
+    else:
+        # A single value maps to the first color
+        rgb = np.repeat(stops[:1], len(values), axis=0)
+    # branca truncates the interpolated channel floats to bytes the same way
+    rgb = (rgb * 255.9999).astype(np.int64)
+    packed = (rgb[:, 0] << 24) | (rgb[:, 1] << 16) | (rgb[:, 2] << 8) | 0xff
+    return np.char.mod('#%08x', packed).astype(object)
+
+def plot_fire_detections_pydeck(df, dot_size_multiplier=1.0, color_palette='inferno', category="fires"):
+    """
+    Plot fire detections as a deck.gl scatterplot for large overview maps.
+    
+    Points are drawn with WebGL, so the map stays responsive with far more
+    detections than the folium CircleMarker map. Colors follow the same
+    temperature palette.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with fire data
+        dot_size_multiplier (float): Multiplier for marker size
+        color_palette (str): Color palette name
+        category (str): Category of data ('fires', 'flares', 'volcanoes', 'raw data')
+        
+    Returns:
+        pydeck.Deck: Deck with a single 'detections' layer, or None if there is nothing to plot
+    """
+    # Filter out noise points (-1) if category is not raw data
+    plot_df = df[df['cluster'] >= 0] if category != "raw data" else df
+    if plot_df.empty:
+        return None
+    
+    lat = plot_df['latitude'].to_numpy()
+    lon = plot_df['longitude'].to_numpy()
+    
+    # Temperature colors, default blue where the temperature is missing
+    colors = np.empty((len(plot_df), 3), dtype=np.uint8)
+    colors[:] = (49, 134, 204)
+    temp_col = get_temp_column(plot_df)
+    if temp_col:
+        temps = plot_df[temp_col].to_numpy(dtype=float)
+        valid = ~np.isnan(temps)
+        if valid.any():
+            palette = COLOR_PALETTES.get(color_palette, COLOR_PALETTES['inferno'])
+            colors[valid] = _palette_rgb(temps[valid], palette)
+    
+    # Four decimals (~10 m) is plenty for display and keeps the serialized layer small
+    points = pd.DataFrame({
+        'longitude': lon.round(4),
+        'latitude': lat.round(4),
+        'cluster': plot_df['cluster'].to_numpy(),
+        'r': colors[:, 0],
+        'g': colors[:, 1],
+        'b': colors[:, 2],
+    })
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=points,
+        id="detections",
+        get_position='[longitude, latitude]',
+        get_fill_color='[r, g, b]',
+        get_radius=6 * dot_size_multiplier,
+        radius_units='pixels',
+        stroked=True,
+        get_line_color=[255, 255, 255],
+        line_width_min_pixels=0.5,
+        opacity=0.9,
+        pickable=True
+    )
+    
+    # Fit the view to the bounding box of the points
+    view_state = pdk.data_utils.compute_view([[lon.min(), lat.min()], [lon.max(), lat.max()]])
+    
+    return pdk.Deck(
+        layers=[layer],
+        initial_view_state=view_state,
+        tooltip={"text": "Cluster {cluster} - ({latitude}, {longitude})"}
+    )
+
+def playback_layer_data(df, dot_size_multiplier=1.0, color_palette='inferno'):
+    """
+    Build the GeoJSON points and legend for one playback date.
+    
+    The playback map component keeps its Leaflet map between dates and only
+    swaps these points, so markers follow the selected-cluster style of the
+    folium map.
+    
+    Args:
+        df (pandas.DataFrame): Detections of the selected cluster on one date
+        dot_size_multiplier (float): Multiplier for marker size
+        color_palette (str): Color palette name
+    
+    Returns:
+        dict: 'features' list of GeoJSON point features and 'legend' (or None)
+    """
+    lat = df['latitude'].to_numpy(dtype=float)
+    lon = df['longitude'].to_numpy(dtype=float)
+    
+    # Temperature colors, default red where the temperature is missing
+    colors = np.full(len(df), '#ff3300', dtype=object)
+    temps = None
+    legend = None
+    temp_col = get_temp_column(df)
+    if temp_col and not df.empty:
+        temps = df[temp_col].to_numpy(dtype=float)
+        valid = ~np.isnan(temps)
+        if valid.any():
+            palette = COLOR_PALETTES.get(color_palette, COLOR_PALETTES['inferno'])
+            colors[valid] = ['#%02x%02x%02x' % tuple(rgb) for rgb in _palette_rgb(temps[valid], palette)]
+            legend = {
+                'colors': palette,
+                'vmin': round(float(temps[valid].min()), 2),
+                'vmax': round(float(temps[valid].max()), 2),
+                'caption': 'Temperature (K)'
+            }
+    
+    features = []
+    for i, (cluster, acq_date, acq_time, frp) in enumerate(zip(
+            df['cluster'], df['acq_date'], df['acq_time'], df['frp'])):
+        popup = (
+            f"<b>Cluster:</b> {cluster}<br>"
+            f"<b>Date:</b> {format_date(acq_date)}<br>"
+            f"<b>Time:</b> {acq_time}<br>"
+            f"<b>FRP:</b> {frp:.2f}<br>"
+            f"<b>Coordinates:</b> {lat[i]:.4f}, {lon[i]:.4f}<br>"
+        )
+        if temps is not None and not np.isnan(temps[i]):
+            popup += f"<b>Temperature:</b> {temps[i]:.2f}K<br>"
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(lon[i], 5), round(lat[i], 5)]},
+            'properties': {
+                'color': colors[i],
+                'popup': popup,
+                'tooltip': f"Cluster {cluster} - Selected - ({lat[i]:.4f}, {lon[i]:.4f})"
+            }
+        })
+    
+    return {'features': features, 'legend': legend, 'radius': 8 * dot_size_multiplier}
+
 def create_export_map(data, title, basemap_tiles, basemap='Satellite', zoom_level=None, dot_color=None, border_color=None):
     """
     Create a simplified map for export.
@@ -442,37 +717,68 @@ def create_export_map(data, title, basemap_tiles, basemap='Satellite', zoom_leve
     Returns:
         str: HTML string representation of the map
     """
-    from app.config.settings import COLOR_PALETTES
-    
     if data.empty:
         return None
     
-    # Calculate the bounding box
-    min_lat = data['latitude'].min()
-    max_lat = data['latitude'].max()
-    min_lon = data['longitude'].min()
-    max_lon = data['longitude'].max()
-    
-    # Create a map centered on the mean coordinates
-    center_lat = (min_lat + max_lat) / 2
-    center_lon = (min_lon + max_lon) / 2
-    
     # Always use satellite basemap for exports by default
     initial_tiles = 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}'
-    tile_attr = 'Satellite Basemap'
     
     # If user specifically selected a different basemap, honor that choice
     if basemap != 'Satellite' and basemap in basemap_tiles:
         initial_tiles = basemap_tiles[basemap]
     
-    # Create the map with a default zoom level if not specified
-    if zoom_level is None:
-        zoom_level = 10
+    # Only the coordinates and temperatures end up in the map, so a digest of
+    # them identifies the frame and repeated exports reuse the rendered HTML
+    temp_col = get_temp_column(data)
+    columns = ('latitude', 'longitude') + ((temp_col,) if temp_col else ())
+    values = np.ascontiguousarray(data[list(columns)].to_numpy(dtype=float))
+    data_hash = hashlib.blake2b(values).hexdigest()
+    
+    # The values are handed over on the side, so the cache only keeps the digest
+    _export_pending.values = values
+    try:
+        return _export_html(data_hash, columns, title, initial_tiles, zoom_level, dot_color, border_color)
+    finally:
+        _export_pending.values = None
+
+@lru_cache(maxsize=32)
+def _export_html(data_hash, columns, title, initial_tiles, zoom_level, dot_color, border_color):
+    """
+    Render the export map HTML for the values set by create_export_map.
+    
+    Args:
+        data_hash (str): Digest of the point values, the cache key for them
+        columns (tuple): Column names of the values
+        title (str): Map title
+        initial_tiles (str): Tiles of the basemap
+        zoom_level (int): Specific zoom level to use, or None to fit the points
+        dot_color (str): Color for dots if not using temperature-based coloring
+        border_color (str): Border color for dots
+        
+    Returns:
+        str: HTML document of the map
+    """
+    data = pd.DataFrame(_export_pending.values, columns=list(columns))
     
-    m = folium.Map(location=[center_lat, center_lon], 
-                  zoom_start=zoom_level,
-                  tiles=initial_tiles,
-                  attr=tile_attr)
+    # Calculate the bounding box
+    min_lat, min_lon, max_lat, max_lon = _lat_lon_bounds(data)
+    
+    # Create a map centered on the mean coordinates
+    center_lat = (min_lat + max_lat) / 2
+    center_lon = (min_lon + max_lon) / 2
+    
+    tile_attr = 'Satellite Basemap'
+    
+    # Use the requested zoom level, otherwise fit the view to the points
+    # before the tiles are attached so they are only fetched for that view
+    if zoom_level is not None:
+        m = folium.Map(location=[center_lat, center_lon], 
+                      zoom_start=zoom_level,
+                      tiles=None)
+    else:
+        m = folium.Map(location=[center_lat, center_lon], tiles=None)
+        m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]], padding=(50, 50), max_zoom=_FIT_MAX_ZOOM)
+    folium.TileLayer(initial_tiles, attr=tile_attr).add_to(m)
     
     if USE_GEOJSON_BORDERS and title:
         # Extract country name from title
@@ -510,9 +816,6 @@ def create_export_map(data, title, basemap_tiles, basemap='Satellite', zoom_leve
     """
     m.get_root().html.add_child(folium.Element(attribution_css))
     
-    # Fit bounds to ensure all points are visible
-    m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]], padding=(50, 50))
-    
     # Add the title with clean styling
     title_html = f'''
     <style>
@@ -575,16 +878,19 @@ def create_export_map(data, title, basemap_tiles, basemap='Satellite', zoom_leve
         )
         colormap.add_to(m)
     
+    # Find the points with a usable temperature in one pass over the column
+    has_temp = data[temp_col].notna().to_numpy() if temp_col else np.zeros(len(data), dtype=bool)
+    
     # Plot the points with temperature-based coloring if available
-    for idx, point in data.iterrows():
+    for i, point in enumerate(data.itertuples(index=False)):
         # Determine point color based on temperature or provided color
-        if temp_col and not pd.isna(point[temp_col]) and not dot_color:
-            fill_color = colormap(point[temp_col])
+        if has_temp[i] and not dot_color:
+            fill_color = colormap(getattr(point, temp_col))
         else:
             fill_color = dot_color
             
         folium.CircleMarker(
-            location=[point['latitude'], point['longitude']],
+            location=[point.latitude, point.longitude],
             radius=6,
             color=border_color,
             weight=1.5,
@@ -593,8 +899,8 @@ def create_export_map(data, title, basemap_tiles, basemap='Satellite', zoom_leve
             fill_opacity=0.9
         ).add_to(m)
     
-    # Save to HTML string with additional fixes for export
-    html_string = m._repr_html_()
+    # Render the document itself rather than the notebook iframe wrapper
+    html_string = m.get_root().render()
     
     # Fix any remaining issues in the HTML that could cause whitespace
     html_string = html_string.replace('<body>', '<body style="margin:0; padding:0; overflow:hidden;">')
@@ -5,7 +5,7 @@ Provides functions to create and manage the sidebar UI.
 import streamlit as st
 import pandas as pd
 
-from app.core.utils import get_category_display_name, get_category_singular
+from app.core.utils import get_category_display_name, get_category_singular, get_cluster_playback_dates
 
 def render_sidebar_content(cluster_summary, category, playback_date=None):
     """
@@ -42,8 +42,7 @@ def render_sidebar_content(cluster_summary, category, playback_date=None):
             st.session_state.selected_cluster = cluster_id
             
             # Get unique dates for the selected cluster
-            cluster_points = st.session_state.results[st.session_state.results['cluster'] == st.session_state.selected_cluster]
-            unique_dates = sorted(cluster_points['acq_date'].unique())
+            unique_dates = get_cluster_playback_dates(cluster_id)
             
             # Store the dates and initialize to the first one
             st.session_state.playback_dates = unique_dates
@@ -5,15 +5,41 @@ Provides functions to create and manage timeline-related functionality.
 import streamlit as st
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
+import folium
+import pandas as pd
 
-from app.core.utils import get_category_display_name, get_category_singular
+from app.core.utils import get_category_display_name, get_category_singular, format_date
 from app.ui.map import create_export_map
 from app.config.settings import BASEMAP_TILES
 
+def _step_playback(step):
+    """
+    Move the playback index by a number of dates, staying within the playback dates.
+    
+    Args:
+        step (int): Number of dates to move (negative to go back)
+    """
+    new_index = st.session_state.get('playback_index', 0) + step
+    if 0 <= new_index < len(st.session_state.get('playback_dates', [])):
+        st.session_state.playback_index = new_index
+
+def _sync_playback_slider(slider_key):
+    """
+    Copy the date slider position into the playback index.
+    
+    Args:
+        slider_key (str): Session state key of the date slider
+    """
+    st.session_state.playback_index = st.session_state[slider_key]
+
 def create_arrow_navigation(key_suffix=""):
     """
     Create arrow navigation buttons and JavaScript for keyboard navigation.
     
+    The controls update the playback index in callbacks, which run before the
+    next rerun, so no extra st.rerun() is needed and a surrounding fragment
+    only reruns itself.
+    
     Args:
         key_suffix (str): Suffix for button keys to ensure uniqueness
     """
@@ -22,10 +48,7 @@ def create_arrow_navigation(key_suffix=""):
     
     with col1:
         prev_key = f"prev_btn_{key_suffix}" if key_suffix else "prev_btn"
-        prev_clicked = st.button("◀", key=prev_key, help="Previous Date (Left Arrow)", on_click=None)
-        if prev_clicked and st.session_state.get('playback_index', 0) > 0:
-            st.session_state.playback_index -= 1
-            st.rerun()
+        st.button("◀", key=prev_key, help="Previous Date (Left Arrow)", on_click=_step_playback, args=(-1,))
     
     with col2:
         playback_dates = st.session_state.get('playback_dates', [])
@@ -36,33 +59,24 @@ def create_arrow_navigation(key_suffix=""):
                 current_date = playback_dates[playback_index]
                 total_dates = len(playback_dates)
                 
-                # Date slider
+                # Date slider, kept in step with the index changed by the arrow buttons
                 slider_key = f"date_slider_{key_suffix}" if key_suffix else "date_slider_direct"
-                date_index = st.slider(
+                st.session_state[slider_key] = playback_index
+                st.slider(
                     "Select Date", 
                     0, 
                     total_dates - 1, 
-                    playback_index,
                     key=slider_key,
-                    help="Use slider or arrow buttons to change the date"
+                    help="Use slider or arrow buttons to change the date",
+                    on_change=_sync_playback_slider,
+                    args=(slider_key,)
                 )
-                
-                # Update index if slider changed
-                if date_index != playback_index:
-                    st.session_state.playback_index = date_index
-                    st.rerun()
                     
-                st.write(f"**Current Date: {current_date}** (Day {playback_index + 1} of {total_dates})")
+                st.write(f"**Current Date: {format_date(current_date)}** (Day {playback_index + 1} of {total_dates})")
     
     with col3:
         next_key = f"next_btn_{key_suffix}" if key_suffix else "next_btn"
-        next_clicked = st.button("▶", key=next_key, help="Next Date (Right Arrow)", on_click=None)
-        playback_dates = st.session_state.get('playback_dates', [])
-        playback_index = st.session_state.get('playback_index', 0)
-        
-        if next_clicked and playback_index < len(playback_dates) - 1:
-            st.session_state.playback_index += 1
-            st.rerun()
+        st.button("▶", key=next_key, help="Next Date (Right Arrow)", on_click=_step_playback, args=(1,))
     
     # Add JavaScript for keyboard navigation
     js_code = """
@@ -100,10 +114,6 @@ def create_export_map(data, title, basemap_tiles, basemap, dot_color='#ff3300',
     Returns:
         str: HTML string representation of the map
     """
-    import pandas as pd
-    import folium
-    import streamlit as st
-    
     if data.empty:
         return None
     
@@ -201,9 +211,9 @@ def create_export_map(data, title, basemap_tiles, basemap, dot_color='#ff3300',
     m.get_root().html.add_child(folium.Element(title_html))
     
     # Add each point with custom colors
-    for idx, row in data.iterrows():
+    for lat, lon in data[[lat_col, lon_col]].itertuples(index=False, name=None):
         folium.CircleMarker(
-            location=[row[lat_col], row[lon_col]],
+            location=[lat, lon],
             radius=6,
             color=border_color,         # Border color
             weight=border_width,        # Border width
@@ -232,9 +242,6 @@ def export_timeline(df, cluster_id=None, category="fires", playback_dates=None,
         basemap_tiles (dict): Dictionary mapping of basemap names to tile URLs
         basemap (str): Selected basemap name
     """
-    import streamlit as st
-    from app.core.utils import get_category_display_name, get_category_singular
-    
     # Initialize basemap_tiles if not provided
     if basemap_tiles is None:
         basemap_tiles = {
@@ -264,9 +271,7 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
         basemap_tiles (dict): Dictionary mapping of basemap names to tile URLs
         basemap (str): Selected basemap name
     """
-    import streamlit as st
     import time
-    from app.core.utils import get_category_display_name, get_category_singular
     
     # Get data for the selected cluster
     cluster_data = df[df['cluster'] == cluster_id]
@@ -305,11 +310,11 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
         all_lon = cluster_data[lon_col].tolist()
     
     for i, date in enumerate(sorted(dates_with_data)):
-        status_text.write(f"Processing frame {i+1}/{total_dates}: {date}")
+        status_text.write(f"Processing frame {i+1}/{total_dates}: {format_date(date)}")
         progress_bar.progress((i+1)/total_dates)
         
         # Create map for this date
-        playback_title = f"{get_category_display_name(category)} {cluster_id} - {date}"
+        playback_title = f"{get_category_display_name(category)} {cluster_id} - {format_date(date)}"
         
         # Filter data for this date and cluster
         date_data = df[(df['cluster'] == cluster_id) & (df['acq_date'] == date)].copy()
@@ -361,9 +366,7 @@ def export_all_clusters_timeline(df, category, playback_dates, basemap_tiles, ba
         basemap_tiles (dict): Dictionary mapping of basemap names to tile URLs
         basemap (str): Selected basemap name
     """
-    import streamlit as st
     import time
-    from app.core.utils import get_category_display_name, get_category_singular
     from app.ui.map import create_export_map
     
     # Filter out noise points
@@ -409,11 +412,11 @@ def export_all_clusters_timeline(df, category, playback_dates, basemap_tiles, ba
         basemap = 'Satellite'
     
     for i, date in enumerate(dates_with_data):
-        status_text.write(f"Processing frame {i+1}/{total_dates}: {date}")
+        status_text.write(f"Processing frame {i+1}/{total_dates}: {format_date(date)}")
         progress_bar.progress((i+1)/total_dates)
         
         # Create map for this date
-        playback_title = f"All {get_category_display_name(category)}s - {date}"
+        playback_title = f"All {get_category_display_name(category)}s - {format_date(date)}"
         
         # Filter data for this date across all clusters
         date_data = valid_data[valid_data[date_col] == date].copy()
@@ -828,9 +831,7 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
         basemap_tiles (dict): Dictionary mapping of basemap names to tile URLs
         basemap (str): Selected basemap name
     """
-    import streamlit as st
     import time
-    from app.core.utils import get_category_display_name, get_category_singular
     
     # Get data for the selected cluster ONLY
     cluster_data = df[df['cluster'] == cluster_id].copy()
@@ -865,11 +866,11 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
     lon_col = next((col for col in ['longitude', 'Longitude', 'lon', 'Lon'] if col in cluster_data.columns), None)
     
     for i, date in enumerate(sorted(dates_with_data)):
-        status_text.write(f"Processing frame {i+1}/{total_dates}: {date}")
+        status_text.write(f"Processing frame {i+1}/{total_dates}: {format_date(date)}")
         progress_bar.progress((i+1)/total_dates)
         
         # Create map for this date
-        playback_title = f"{get_category_display_name(category)} {cluster_id} - {date}"
+        playback_title = f"{get_category_display_name(category)} {cluster_id} - {format_date(date)}"
         
         # Filter data for this date and cluster
         date_data = cluster_data[cluster_data['acq_date'] == date].copy()
@@ -919,10 +920,7 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
         basemap_tiles (dict): Dictionary mapping of basemap names to tile URLs
         basemap (str): Selected basemap name
     """
-    import streamlit as st
     import time
-    import pandas as pd
-    from app.core.utils import get_category_display_name, get_category_singular
     
     # Get data for the selected cluster ONLY - with strict filtering
     cluster_data = df[df['cluster'] == cluster_id].copy()
@@ -972,11 +970,11 @@ def export_single_cluster_timeline(df, cluster_id, category, playback_dates, bas
     lon_col = next((col for col in ['longitude', 'Longitude', 'lon', 'Lon'] if col in cluster_data.columns), None)
     
     for i, date in enumerate(sorted(dates_with_data)):
-        status_text.write(f"Processing frame {i+1}/{total_dates}: {date}")
+        status_text.write(f"Processing frame {i+1}/{total_dates}: {format_date(date)}")
         progress_bar.progress((i+1)/total_dates)
         
         # Create map for this date
-        playback_title = f"{get_category_display_name(category)} {cluster_id} - {date}"
+        playback_title = f"{get_category_display_name(category)} {cluster_id} - {format_date(date)}"
         
         # Filter data for this date and ONLY this cluster
         date_data = cluster_data[cluster_data['acq_date'] == date].copy()
@@ -1035,10 +1033,6 @@ def create_export_map(data, title, basemap_tiles, basemap, dot_color='#ff3300',
     Returns:
         str: HTML string representation of the map
     """
-    import pandas as pd
-    import folium
-    import streamlit as st
-    
     if data.empty:
         return None
     
@@ -1141,9 +1135,9 @@ def create_export_map(data, title, basemap_tiles, basemap, dot_color='#ff3300',
     m.get_root().html.add_child(folium.Element(title_html))
     
     # Add each point with custom colors
-    for idx, row in data.iterrows():
+    for lat, lon in data[[lat_col, lon_col]].itertuples(index=False, name=None):
         folium.CircleMarker(
-            location=[row[lat_col], row[lon_col]],
+            location=[lat, lon],
             radius=6,
             color=border_color,         # Border color
             weight=border_width,        # Border width
@@ -6,7 +6,12 @@ from unittest.mock import patch, MagicMock
 import pandas as pd
 from io import StringIO
 
-from app.core.firms_handler import FIRMSHandler
+import numpy as np
+
+from app.core.firms_handler import (
+    FIRMSHandler, _border_grid, _build_cluster_coords, _dbscan_labels, _drop_duplicate_detections,
+    _grid_verdicts, _tiled_dbscan_labels, CELL_BORDER, CELL_INSIDE
+)
 
 class TestFIRMSHandler(unittest.TestCase):
     """Test the FIRMSHandler class."""
@@ -23,6 +28,94 @@ class TestFIRMSHandler(unittest.TestCase):
         # Test an unknown country
         self.assertIsNone(self.handler.get_country_bbox('Narnia'))
     
+    def test_parse_bbox(self):
+        """Test that bounding box strings are parsed once and cached."""
+        bbox = '60.52,29.31,75.15,38.48'
+        parsed = self.handler._parse_bbox(bbox)
+        self.assertEqual(parsed, (60.52, 29.31, 75.15, 38.48))
+        self.assertIs(self.handler._parse_bbox(bbox), parsed)
+    
+    def test_drop_duplicate_detections(self):
+        """Test that repeated detections are dropped but distinct satellites are kept."""
+        df = pd.read_csv(StringIO("""latitude,longitude,acq_date,acq_time,satellite,frp
+36.1,70.2,2023-01-01,1200,N,10.5
+36.1,70.2,2023-01-01,1200,N,10.5
+36.1,70.2,2023-01-01,1200,1,10.5
+36.2,70.3,2023-01-01,1205,N,12.3"""))
+        result = _drop_duplicate_detections(df)
+        
+        self.assertEqual(len(result), 3)
+        self.assertEqual(list(result.index), [0, 1, 2])
+    
+    def test_build_cluster_coords(self):
+        """Test that clustering inputs are contiguous float32 (lat, lon, scaled_day) rows."""
+        lat = np.array([36.1, 36.2, 36.3])
+        lon = np.array([70.2, 70.3, 70.4])
+        day = np.array([0, 1, 2])
+        coords = _build_cluster_coords(lat, lon, day, 0.005)
+        
+        self.assertEqual(coords.dtype, np.float32)
+        self.assertTrue(coords.flags['C_CONTIGUOUS'])
+        np.testing.assert_allclose(coords, np.column_stack([lat, lon, day * 0.005]), rtol=1e-6)
+        self.assertEqual(_build_cluster_coords(lat, lon).shape, (3, 2))
+    
+    def test_tiled_dbscan_matches_dbscan(self):
+        """Test that tiled clustering stitches clusters that cross tile borders."""
+        from sklearn.cluster import DBSCAN
+        
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 1, 2000)
+        line = np.column_stack([30 + 2 * t, 60 + 3 * t]) + rng.normal(0, 0.002, (2000, 2))
+        noise = rng.uniform([30, 60], [32, 63], (300, 2))
+        coords = np.vstack([line, noise]).astype(np.float32)
+        
+        expected = DBSCAN(eps=0.01, min_samples=5).fit(coords).labels_
+        labels = _tiled_dbscan_labels(coords, 0.01, 5, n_tiles=(3, 3))
+        
+        np.testing.assert_array_equal(labels == -1, expected == -1)
+        self.assertEqual(len(set(labels)), len(set(expected)))
+        # Same partition up to relabelling
+        pairs = set(zip(labels[labels >= 0], expected[expected >= 0]))
+        self.assertEqual(len(pairs), len(set(expected)) - (1 if -1 in expected else 0))
+    
+    def test_dbscan_labels_skips_sparse_points(self):
+        """Test that the sparse-bin prefilter leaves DBSCAN labels unchanged."""
+        from sklearn.cluster import DBSCAN
+        
+        rng = np.random.default_rng(1)
+        centres = rng.uniform([30, 60], [32, 63], (20, 2))
+        blobs = np.repeat(centres, 50, axis=0) + rng.normal(0, 0.004, (1000, 2))
+        noise = rng.uniform([30, 60], [32, 63], (2000, 2))
+        coords = np.vstack([blobs, noise]).astype(np.float32)
+        rng.shuffle(coords)
+        
+        expected = DBSCAN(eps=0.01, min_samples=5).fit(coords).labels_
+        np.testing.assert_array_equal(_dbscan_labels(coords, 0.01, 5), expected)
+    
+    def test_border_grid_matches_polygon(self):
+        """Test that grid verdicts plus border checks reproduce point-in-polygon."""
+        import shapely
+        from shapely.strtree import STRtree
+        
+        # Concave L-shaped country
+        polygon = shapely.Polygon([(0, 0), (4, 0), (4, 1), (1, 1), (1, 3), (0, 3)])
+        parts = shapely.get_parts([polygon])
+        tree = STRtree(parts)
+        grid = _border_grid(parts, tree, polygon.bounds, n_cells=16)
+        
+        rng = np.random.default_rng(0)
+        lon = rng.uniform(-1, 5, 5000)
+        lat = rng.uniform(-1, 4, 5000)
+        verdicts = _grid_verdicts(lon, lat, grid)
+        
+        inside = verdicts == CELL_INSIDE
+        border_idx = np.flatnonzero(verdicts == CELL_BORDER)
+        point_idx, _ = tree.query(shapely.points(lon[border_idx], lat[border_idx]), predicate='within')
+        inside[border_idx[point_idx]] = True
+        
+        np.testing.assert_array_equal(inside, shapely.contains_xy(polygon, lon, lat))
+        self.assertLess(len(border_idx), len(lon) // 2)
+    
     @patch('requests.Session.get')
     @patch('streamlit.spinner')
     @patch('streamlit.write')
@@ -36,6 +129,8 @@ class TestFIRMSHandler(unittest.TestCase):
 36.1,70.2,315.5,10.5,2023-01-01,1200
 36.2,70.3,320.1,12.3,2023-01-01,1205
 36.3,70.4,318.7,11.8,2023-01-01,1210"""
+        mock_response.content = mock_response.text.encode()
+        mock_response.iter_content.return_value = iter([mock_response.content])
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
         